@@ -0,0 +1,199 @@
+"""
+Configuration loading for competitor tracking
+Parses config.yaml with the LibYAML loader when available and reparses only when the file changes
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+import yaml
+from contextlib import contextmanager
+from types import MappingProxyType
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+try:
+    import fcntl
+except ImportError:  # Windows: writes are still atomic, just not serialized
+    fcntl = None
+
+DEFAULT_CONFIG_PATH = os.environ.get('CONFIG_PATH', 'config.yaml')
+
+# abspath -> ((st_mtime_ns, st_size, st_ino), parsed config)
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _signature(st):
+    # An edit within the same mtime tick still changes the size, and
+    # os.replace() from save_config() always changes the inode
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+def _freeze(value):
+    """Read-only view of parsed YAML: dicts become MappingProxyType, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    """Inverse of _freeze: a fresh, mutable dict/list tree"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def load_config(path=DEFAULT_CONFIG_PATH):
+    """Return the parsed config, read-only all the way down, reparsed only when the file changes.
+
+    The result is shared by every caller, so nested dicts are MappingProxyType
+    and lists are tuples; use load_config_copy() to edit.
+    """
+    path = os.path.abspath(path)
+    sig = _signature(os.stat(path))
+    cached = _cache.get(path)
+    if cached is not None and cached[0] == sig:
+        return cached[1]
+    with _cache_lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == sig:  # another thread just parsed it
+            return cached[1]
+        with open(path, 'r', encoding='utf-8') as f:
+            data = _freeze(yaml.load(f, Loader=_Loader) or {})
+        _cache[path] = (sig, data)
+        return data
+
+
+def load_config_copy(path=DEFAULT_CONFIG_PATH):
+    """Return a private, mutable deep copy of the config for read-modify-write callers"""
+    return _thaw(load_config(path))
+
+
+_COMPETITOR_KEYS = ('name', 'website', 'pages')
+_PAGE_KEYS = ('url', 'type', 'selector')
+# Characters JSON leaves raw but YAML rejects in a double-quoted scalar:
+# DEL/C1 controls, lone surrogates and the U+FFFE/U+FFFF non-characters
+_YAML_UNPRINTABLE = re.compile('[\x7f-\x9f\ud800-\udfff\ufffe\uffff]')
+
+
+def _scalar(value):
+    # A JSON string is also a valid YAML double-quoted scalar, so every
+    # value is quoted and never mistaken for a bool, number or null
+    if value is None:
+        return 'null'
+    if not isinstance(value, str):
+        raise TypeError(value)
+    return _YAML_UNPRINTABLE.sub(lambda m: f'\\u{ord(m.group()):04x}',
+                                 json.dumps(value, ensure_ascii=False))
+
+
+def _emit_competitors(competitors):
+    """Emit the competitors list by hand for its fixed name/website/pages shape.
+
+    Returns None when the list doesn't have that shape, so the caller falls
+    back to yaml.dump.
+    """
+    if not competitors:
+        return 'competitors: []\n'
+    lines = ['competitors:']
+    try:
+        for comp in competitors:
+            if not isinstance(comp, dict) or not set(comp) <= set(_COMPETITOR_KEYS):
+                return None
+            prefix = '- '
+            for key in ('name', 'website'):
+                if key in comp:
+                    lines.append(f'{prefix}{key}: {_scalar(comp[key])}')
+                    prefix = '  '
+            if 'pages' not in comp:
+                if prefix == '- ':
+                    lines.append('- {}')
+                continue
+            pages = comp['pages']
+            if not isinstance(pages, list):
+                return None
+            lines.append(f'{prefix}pages:' + ('' if pages else ' []'))
+            for page in pages:
+                if not isinstance(page, dict) or not set(page) <= set(_PAGE_KEYS):
+                    return None
+                item = '  - '
+                for key in _PAGE_KEYS:
+                    if key in page:
+                        lines.append(f'{item}{key}: {_scalar(page[key])}')
+                        item = '    '
+                if item == '  - ':
+                    lines.append('  - {}')
+    except TypeError:
+        return None
+    lines.append('')
+    text = '\n'.join(lines)
+    # Must read back identically, or the next load_config would fail/differ
+    try:
+        if yaml.load(text, Loader=_Loader) != {'competitors': competitors}:
+            return None
+    except yaml.YAMLError:
+        return None
+    return text
+
+
+def _dump(config, f):
+    config = dict(config)
+    competitors = _emit_competitors(config['competitors']) if 'competitors' in config else ''
+    if competitors is None:
+        yaml.dump(config, f, Dumper=_Dumper, default_flow_style=False, allow_unicode=True)
+        return
+    config.pop('competitors', None)
+    if config:
+        yaml.dump(config, f, Dumper=_Dumper, default_flow_style=False, allow_unicode=True)
+    f.write(competitors)
+
+
+@contextmanager
+def _write_lock(path):
+    """Hold an exclusive lock on `path`.lock so concurrent writers take turns"""
+    if fcntl is None:
+        yield
+        return
+    with open(path + '.lock', 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def save_config(config, path=DEFAULT_CONFIG_PATH):
+    """Write config atomically: dump to a temp file, fsync, then rename over `path`.
+
+    Returns False without touching the file when it already holds `config`.
+    """
+    path = os.path.abspath(path)
+    config = _thaw(config)
+    with _write_lock(path):
+        try:
+            if _thaw(load_config(path)) == config:
+                return False
+        except (FileNotFoundError, yaml.YAMLError):
+            pass  # missing or unreadable: write it
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.config-', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                _dump(config, f)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.chmod(tmp, os.stat(path).st_mode & 0o777)  # mkstemp files are 0600
+            except FileNotFoundError:
+                pass
+            os.replace(tmp, path)
+        except BaseException:
+            os.remove(tmp)
+            raise
+    return True
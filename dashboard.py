@@ -8,25 +8,40 @@ Fixes:
   5. Removed flask_wtf CSRF (optional dep causing issues)
 """
 
-from flask import Flask, render_template_string, jsonify, request, Response
-import yaml
-import io
+from flask import Flask, jsonify, request, Response, g, send_file
+from flask.json.provider import DefaultJSONProvider
+import gzip
+import hashlib
+import atexit
 import os
+import queue
 import secrets
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+import tempfile
+import time
+import uuid
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from config_loader import load_config
 from database import CompetitorDB
 from scraper import CompetitorScraper
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT
-from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer,
-                                 Table, TableStyle, HRFlowable)
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 import re
+try:
+    import orjson
+except ImportError:  # fall back to Flask's stdlib json provider
+    orjson = None
+try:
+    from flask_compress import Compress
+except ImportError:  # responses go out uncompressed (static assets are pre-gzipped anyway)
+    Compress = None
+try:
+    import flask_monitoringdashboard as fmd
+except ImportError:  # per-endpoint monitoring is opt-in
+    fmd = None
 
 # ============================================================
 # LOGGING
@@ -41,7 +56,13 @@ def setup_logging():
     ch.setLevel(logging.DEBUG)
     fmt = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     fh.setFormatter(fmt); ch.setFormatter(fmt)
-    logger.addHandler(fh); logger.addHandler(ch)
+    # Request threads only enqueue records; the listener thread does the file I/O
+    log_queue = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.propagate = False
+    listener = QueueListener(log_queue, fh, ch, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     return logger
 
 logger = setup_logging()
@@ -49,13 +70,91 @@ logger = setup_logging()
 # ============================================================
 # APP SETUP
 # ============================================================
+SECRET_KEY_FILE = '.secret_key'
+
+def load_secret_key(path=SECRET_KEY_FILE):
+    """Use SECRET_KEY from the env, else a key generated once and kept on disk."""
+    key = os.environ.get('SECRET_KEY')
+    if key:
+        return key
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+    # Write the key to a private temp file and link it into place, so workers
+    # starting together all end up reading the same complete key.
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(secrets.token_hex(32))
+        try:
+            os.link(tmp, path)
+        except FileExistsError:
+            pass
+    finally:
+        os.remove(tmp)
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read().strip()
+
 app = Flask(__name__)
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', secrets.token_hex(32))
+app.config['SECRET_KEY'] = load_secret_key()
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """jsonify() via orjson; anything orjson can't encode goes through Flask's default."""
+
+    def _options(self, indent=False):
+        opts = orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            opts |= orjson.OPT_SORT_KEYS
+        if indent:
+            opts |= orjson.OPT_INDENT_2
+        return opts
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default,
+                            option=self._options(kwargs.get('indent'))).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Build the body as bytes directly instead of going through dumps()
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(obj, default=self.default,
+                            option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+# Keep keys in insertion order and never pretty-print, even in debug mode
+app.json.sort_keys = False
+app.json.compact = True
+
+# Compress JSON/HTML on the fly. Responses that already carry a
+# Content-Encoding (the pre-gzipped static assets) are left alone.
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 512
+if Compress is not None:
+    Compress(app)
+
+# Flask-Compress rewrites a compressed response's ETag to "<etag>:gzip" /
+# "<etag>:br", so browsers revalidate with the suffixed tag. Strip it before
+# anything parses If-None-Match so the 304 checks compare the bare content tag.
+_COMPRESS_ETAG_SUFFIX = re.compile(r':(?:br|gzip|deflate|zstd)"')
+
+
+@app.before_request
+def strip_compress_etag_suffix():
+    inm = request.environ.get('HTTP_IF_NONE_MATCH')
+    if inm:
+        request.environ['HTTP_IF_NONE_MATCH'] = _COMPRESS_ETAG_SUFFIX.sub('"', inm)
+
 config_path = os.environ.get('CONFIG_PATH', 'config.yaml')
-with open(config_path, 'r', encoding='utf-8') as f:
-    config = yaml.safe_load(f)
+config = load_config(config_path)
 logger.info(f"Configuration loaded from {config_path}")
 
 db = CompetitorDB()
@@ -65,29 +164,75 @@ logger.info("Database and scraper initialized successfully")
 # ============================================================
 # CONSTANTS & VALIDATION
 # ============================================================
-DEFAULT_CHANGE_LIMIT = 50
+# Competitor and change lists load in pages of LIST_PAGE_SIZE rows
+LIST_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
 DEFAULT_DAYS_LOOKBACK = 30
 MAX_PAGES_PER_COMPETITOR = 50
+ALLOWED_PAGE_TYPES = frozenset(('pricing', 'features', 'blog', 'other'))
+_NAME_RE = re.compile(r'[a-zA-Z0-9\s.\-&()]+')
+# Plain http(s)://host[:port][/...] URLs, the common case, are accepted without
+# urlparse(); anything else (IDN hosts, userinfo, IPv6, odd casing) falls
+# through to the full parse, so the accepted set is unchanged.
+_URL_RE = re.compile(r'https?://[A-Za-z0-9.\-]+(?::\d+)?(?:[/?#]\S*)?')
 
-def validate_url(url):
-    if not url or not isinstance(url, str): return False
+# Validators are pure, so results for repeated URLs/names are memoized.
+# The isinstance checks stay outside the cache: JSON can hand us unhashable values.
+@lru_cache(maxsize=1024)
+def _url_is_valid(url):
     try:
         r = urlparse(url)
         return all([r.scheme in ['http', 'https'], r.netloc, len(url) <= 2048])
-    except: return False
+    except ValueError: return False
+
+def validate_url(url):
+    if not url or not isinstance(url, str): return False
+    if len(url) <= 2048 and _URL_RE.fullmatch(url) is not None: return True
+    return _url_is_valid(url)
+
+@lru_cache(maxsize=1024)
+def _name_is_valid(name):
+    if len(name) < 2 or len(name) > 100: return False
+    return _NAME_RE.fullmatch(name) is not None
 
 def validate_competitor_name(name):
     if not name or not isinstance(name, str): return False
-    if len(name) < 2 or len(name) > 100: return False
-    return bool(re.match(r'^[a-zA-Z0-9\s\.\-&\(\)]+$', name))
+    return _name_is_valid(name)
 
 def validate_page_type(t):
-    return t in ['pricing', 'features', 'blog', 'other']
+    return isinstance(t, str) and t in ALLOWED_PAGE_TYPES
 
 def sanitize_string(s, max_length=1000):
     return str(s).strip()[:max_length] if s else ''
 
 
+class ValidationError(ValueError):
+    """Rejected client input; `message` is safe to send back in the 400 response."""
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+def validate_and_normalize_page(page, n):
+    """Check page entry number `n` in one pass and return its cleaned dict."""
+    if not isinstance(page, dict):
+        raise ValidationError(f'Invalid page {n}')
+    url = page.get('url') or ''
+    if not isinstance(url, str) or not validate_url(url.strip()):
+        raise ValidationError(f'Invalid URL for page {n}')
+    page_type = page.get('type', 'other')
+    if not validate_page_type(page_type):
+        raise ValidationError(f'Invalid page type for page {n}')
+    return {'url': url.strip(), 'type': page_type,
+            'selector': sanitize_string(page.get('selector'), max_length=500)}
+
+def validate_pages(pages):
+    if not isinstance(pages, list) or not pages:
+        raise ValidationError('At least one page is required')
+    if len(pages) > MAX_PAGES_PER_COMPETITOR:
+        raise ValidationError(f'At most {MAX_PAGES_PER_COMPETITOR} pages per competitor')
+    return [validate_and_normalize_page(page, n) for n, page in enumerate(pages, 1)]
+
+
 # ============================================================
 # JAVASCRIPT - raw string, zero escaping issues
 # ============================================================
@@ -106,51 +251,26 @@ function toast(msg, dur) {
 }
 function openModal(id) { document.getElementById(id).classList.add('open'); }
 function closeModal(id) { document.getElementById(id).classList.remove('open'); }
-function filterComps() {
-    var s = document.getElementById('comp-search').value.toLowerCase();
-    document.querySelectorAll('.comp-row').forEach(function(r) {
-        r.style.display = r.dataset.name.toLowerCase().includes(s) ? '' : 'none';
-    });
-}
-function filterChanges() {
-    var s = document.getElementById('ch-search').value.toLowerCase();
-    document.querySelectorAll('.change-row').forEach(function(r) {
-        var match = r.dataset.comp.toLowerCase().includes(s) || r.dataset.desc.toLowerCase().includes(s);
-        r.style.display = match ? '' : 'none';
-    });
-}
-function makeTypeSelect(selected) {
-    var fg = document.createElement('div'); fg.className = 'fg';
-    var lbl = document.createElement('label'); lbl.textContent = 'Type *';
-    var sel = document.createElement('select'); sel.className = 'p-type'; sel.required = true;
-    ['pricing','features','blog','other'].forEach(function(v) {
-        var opt = document.createElement('option');
-        opt.value = v; opt.textContent = v.charAt(0).toUpperCase()+v.slice(1);
-        if (v === selected) opt.selected = true;
-        sel.appendChild(opt);
-    });
-    fg.appendChild(lbl); fg.appendChild(sel); return fg;
+function filterComps() { searchList('comp-list', document.getElementById('comp-search').value); }
+function filterChanges() { searchList('ch-list', document.getElementById('ch-search').value); }
+// Page blocks are cloned from <template id="page-entry-tpl"> so the markup
+// (and its type options) is parsed once, not rebuilt per block.
+function newPage(n, data, removable) {
+    var f = document.getElementById('page-entry-tpl').content.cloneNode(true);
+    var block = f.querySelector('.page-block');
+    f.querySelector('.page-block-header span').textContent = 'Page ' + n;
+    var rb = f.querySelector('.page-block-header button');
+    if (removable) rb.onclick = function() { block.remove(); }; else rb.remove();
+    if (data) {
+        f.querySelector('.p-url').value = data.url || '';
+        f.querySelector('.p-type').value = data.type || 'other';
+        f.querySelector('.p-sel').value = data.selector || '';
+    }
+    return f;
 }
 function addPageBlock(containerId) {
     var c = document.getElementById(containerId);
-    var n = c.querySelectorAll('.page-block').length + 1;
-    var block = document.createElement('div'); block.className = 'page-block';
-    var header = document.createElement('div'); header.className = 'page-block-header';
-    var title = document.createElement('span'); title.textContent = 'Page ' + n;
-    header.appendChild(title);
-    var rb = document.createElement('button'); rb.type = 'button'; rb.className = 'btn sm red'; rb.textContent = 'Remove';
-    rb.onclick = function() { block.remove(); };
-    header.appendChild(rb); block.appendChild(header);
-    var urlFg = document.createElement('div'); urlFg.className = 'fg'; urlFg.innerHTML = '<label>URL *</label>';
-    var urlInp = document.createElement('input'); urlInp.type = 'url'; urlInp.className = 'p-url';
-    urlInp.placeholder = 'https://example.com/pricing'; urlInp.required = true;
-    urlFg.appendChild(urlInp); block.appendChild(urlFg);
-    block.appendChild(makeTypeSelect('pricing'));
-    var selFg = document.createElement('div'); selFg.className = 'fg'; selFg.innerHTML = '<label>CSS Selector (optional)</label>';
-    var selInp = document.createElement('input'); selInp.type = 'text'; selInp.className = 'p-sel';
-    selInp.placeholder = 'Leave empty for automatic';
-    selFg.appendChild(selInp); block.appendChild(selFg);
-    c.appendChild(block);
+    c.appendChild(newPage(c.querySelectorAll('.page-block').length + 1, null, true));
 }
 function readPages(containerId) {
     var pages = [];
@@ -167,7 +287,11 @@ function addComp(e) {
     }).then(function(r){return r.json()}).then(function(d){
         var el = document.getElementById('add-msg');
         el.textContent = d.message; el.className = 'alert ' + (d.success?'ok':'err');
-        if (d.success) setTimeout(function(){location.reload();},1200);
+        if (d.success) {
+            e.target.reset();
+            var pages = document.getElementById('add-pages'); pages.innerHTML = ''; pages.appendChild(newPage(1, null, false));
+            renderStats(d.stats); putCompRow(d.competitor, null);
+        }
     }).catch(function(){toast('Request failed');});
 }
 function viewComp(name) {
@@ -175,7 +299,10 @@ function viewComp(name) {
         if (d.error) { toast('Error: '+d.error); return; }
         var body = document.getElementById('view-body'); body.innerHTML = '';
         var site = document.createElement('p'); site.style.cssText='margin-bottom:1rem;color:#666';
-        site.innerHTML = 'Website: <a href="'+(d.website||'#')+'" target="_blank" style="color:#667eea">'+(d.website||'Not set')+'</a>';
+        site.appendChild(document.createTextNode('Website: '));
+        var siteLink = el('a', null, d.website || 'Not set'); siteLink.target = '_blank'; siteLink.rel = 'noopener'; siteLink.style.color = '#667eea';
+        setHref(siteLink, d.website);
+        site.appendChild(siteLink);
         body.appendChild(site);
         var h = document.createElement('h3'); h.textContent='Tracked Pages'; h.style.marginBottom='.75rem';
         body.appendChild(h);
@@ -184,7 +311,7 @@ function viewComp(name) {
             block.style.cssText='background:#f8f9fa;padding:.75rem 1rem;border-radius:6px;margin-bottom:.5rem';
             var badge = document.createElement('span'); badge.className='badge '+(p.type||'other'); badge.textContent=p.type||'other';
             block.appendChild(badge);
-            var link = document.createElement('a'); link.href=p.url; link.target='_blank';
+            var link = document.createElement('a'); setHref(link, p.url); link.target='_blank'; link.rel='noopener';
             link.style.cssText='color:#667eea;font-size:.88rem;word-break:break-all'; link.textContent=' '+p.url;
             block.appendChild(link);
             if (p.selector) { var sd=document.createElement('div'); sd.style.cssText='font-size:.78rem;color:#999;margin-top:.25rem'; sd.textContent='Selector: '+p.selector; block.appendChild(sd); }
@@ -200,21 +327,7 @@ function editComp(name) {
         document.getElementById('e-name').value = d.name;
         document.getElementById('e-website').value = d.website||'';
         var container = document.getElementById('edit-pages'); container.innerHTML='';
-        (d.pages||[]).forEach(function(p,i){
-            var block=document.createElement('div'); block.className='page-block';
-            var header=document.createElement('div'); header.className='page-block-header';
-            var title=document.createElement('span'); title.textContent='Page '+(i+1); header.appendChild(title);
-            if (i>0) { var rb=document.createElement('button'); rb.type='button'; rb.className='btn sm red'; rb.textContent='Remove'; rb.onclick=function(){block.remove();}; header.appendChild(rb); }
-            block.appendChild(header);
-            var urlFg=document.createElement('div'); urlFg.className='fg'; urlFg.innerHTML='<label>URL *</label>';
-            var urlInp=document.createElement('input'); urlInp.type='url'; urlInp.className='p-url'; urlInp.value=p.url||''; urlInp.required=true;
-            urlFg.appendChild(urlInp); block.appendChild(urlFg);
-            block.appendChild(makeTypeSelect(p.type));
-            var selFg=document.createElement('div'); selFg.className='fg'; selFg.innerHTML='<label>CSS Selector (optional)</label>';
-            var selInp=document.createElement('input'); selInp.type='text'; selInp.className='p-sel'; selInp.value=p.selector||''; selInp.placeholder='Leave empty for automatic';
-            selFg.appendChild(selInp); block.appendChild(selFg);
-            container.appendChild(block);
-        });
+        (d.pages||[]).forEach(function(p,i){ container.appendChild(newPage(i+1, p, i>0)); });
         openModal('edit-overlay');
     }).catch(function(){toast('Error loading competitor');});
 }
@@ -225,42 +338,317 @@ function saveEdit(e) {
         body:JSON.stringify({ original_name:orig, name:document.getElementById('e-name').value, website:document.getElementById('e-website').value, pages:readPages('edit-pages') })
     }).then(function(r){return r.json()}).then(function(d){
         toast(d.message);
-        if (d.success) { closeModal('edit-overlay'); setTimeout(function(){location.reload();},900); }
+        if (d.success) {
+            closeModal('edit-overlay'); renderStats(d.stats);
+            var name = d.competitor.name.length ? d.competitor.name[0] : orig;
+            if (name !== orig) renameChangeRows(orig, name);
+            putCompRow(d.competitor, orig);
+        }
     }).catch(function(){toast('Error saving');});
 }
+// Stored URLs are user input: only http(s) links become clickable, so a
+// javascript: URL can't run from the page.
+function setHref(a, url) {
+    if (/^https?:\/\//i.test(url || '')) a.href = url;
+}
+function el(tag, cls, text) {
+    var e = document.createElement(tag);
+    if (cls) e.className = cls;
+    if (text !== undefined && text !== null) e.textContent = text;
+    return e;
+}
+function renderStats(st) {
+    document.getElementById('st-competitors').textContent = st.total_competitors;
+    document.getElementById('st-changes').textContent = st.total_changes;
+    document.getElementById('st-recent').textContent = st.recent_changes;
+    document.getElementById('st-active').textContent = st.most_active_competitor || 'N/A';
+}
+// Lists arrive column-wise ({field: [values...]}); row i is cols[field][i].
+function compRow(c, i) {
+    var name = c.name[i], last = c.last_scraped[i];
+    var row = el('div', 'comp-row'); row.dataset.name = name;
+    var info = el('div', 'comp-info'); info.appendChild(el('h3', null, name));
+    var meta = el('div', 'comp-meta');
+    meta.appendChild(el('span', null, c.page_count[i] + ' pages'));
+    meta.appendChild(el('span', null, c.change_count[i] + ' changes'));
+    if (last) meta.appendChild(el('span', null, 'Last: ' + last.slice(0, 16)));
+    info.appendChild(meta); row.appendChild(info);
+    var bg = el('div', 'btn-group');
+    var vb = el('button', 'btn sm', 'View'); vb.onclick = function() { viewComp(name); };
+    var eb = el('button', 'btn sm grey', 'Edit'); eb.onclick = function() { editComp(name); };
+    var db = el('button', 'btn sm red', 'Delete'); db.onclick = function() { confirmDelete(name); };
+    bg.appendChild(vb); bg.appendChild(eb); bg.appendChild(db); row.appendChild(bg);
+    return row;
+}
+function changeRow(ch, i) {
+    var comp = ch.competitor_name[i] || '', desc = ch.change_description[i] || '';
+    var type = ch.page_type[i], when = ch.detected_at[i], url = ch.page_url[i];
+    var row = el('div', 'change-row');
+    row.dataset.comp = comp; row.dataset.desc = desc;
+    var hdr = el('div', 'ch-header'), who = el('div');
+    who.appendChild(el('span', 'ch-name', comp));
+    who.appendChild(el('span', 'badge ' + type, type));
+    hdr.appendChild(who);
+    hdr.appendChild(el('span', 'ch-time', when ? when.slice(0, 16) : ''));
+    row.appendChild(hdr);
+    row.appendChild(el('div', 'ch-desc', desc));
+    var a = el('a', 'ch-url', url); setHref(a, url); a.target = '_blank'; a.rel = 'noopener';
+    row.appendChild(a);
+    var more = el('button', 'ch-more', 'Show content'), id = ch.id[i];
+    more.type = 'button'; more.onclick = function() { toggleChangeContent(row, more, id); };
+    row.appendChild(more);
+    return row;
+}
+// Old/new content is only fetched when a change is expanded
+function toggleChangeContent(row, btn, id) {
+    var box = row.querySelector('.ch-content');
+    if (box) { var open = box.style.display === 'none'; box.style.display = open ? '' : 'none'; btn.textContent = open ? 'Hide content' : 'Show content'; return; }
+    btn.disabled = true;
+    fetch('/api/change/' + id).then(function(r){return r.json()}).then(function(d){
+        if (d.error) throw new Error(d.error);
+        box = el('div', 'ch-content');
+        [['Before', d.old_content], ['After', d.new_content]].forEach(function(p) {
+            box.appendChild(el('div', 'ch-content-label', p[0]));
+            box.appendChild(el('pre', null, p[1] || '(empty)'));
+        });
+        row.appendChild(box); btn.textContent = 'Hide content';
+    }).catch(function(){ toast('Error loading change'); }).finally(function(){ btn.disabled = false; });
+}
+// Paged lists: the first page comes with /api/bootstrap, later pages are
+// fetched when the sentinel under the list scrolls into view.
+// `param` is how the next page is asked for: a row offset, or for changes
+// the id of the last row shown (keyset paging).
+var LISTS = {
+    'comp-list': {url: '/api/competitors', key: 'competitors', param: 'offset', first: 'name', build: compRow,
+                  searchKey: function(c, i) { return c.name[i]; },
+                  empty: 'No competitors yet \u2014 add your first one above!', next: null, q: '', seq: 0, index: []},
+    'ch-list': {url: '/api/changes', key: 'changes', param: 'before', first: 'competitor_name', build: changeRow,
+                searchKey: function(c, i) { return (c.competitor_name[i] || '') + '\n' + (c.change_description[i] || ''); },
+                empty: 'No changes yet \u2014 run the scraper!', next: null, q: '', seq: 0, index: []}
+};
+var SEARCH_DEBOUNCE_MS = 150;
+var listObserver = null;
+function appendRows(id, cols) {
+    var L = LISTS[id], list = document.getElementById(id), n = cols[L.first].length;
+    var frag = document.createDocumentFragment();
+    for (var i = 0; i < n; i++) {
+        var row = L.build(cols, i);
+        // Lowercased once here so filtering while typing is a plain substring test
+        L.index.push({el: row, key: L.searchKey(cols, i).toLowerCase()});
+        frag.appendChild(row);
+    }
+    list.appendChild(frag);
+}
+function renderList(id, cols, next) {
+    var L = LISTS[id], list = document.getElementById(id); list.innerHTML = '';
+    L.next = next; L.index = [];
+    if (!cols[L.first].length) { list.appendChild(el('div', 'empty', L.q ? 'No matches.' : L.empty)); return; }
+    appendRows(id, cols);
+    watchSentinel(id);
+}
+function watchSentinel(id) {
+    var s = document.getElementById(id + '-more');
+    if (!listObserver || !s) return;
+    // Re-observing reports the current state, so a sentinel still on screen loads the next page too
+    listObserver.unobserve(s);
+    if (LISTS[id].next !== null) listObserver.observe(s);
+}
+function fetchPage(id, from) {
+    var L = LISTS[id], seq = ++L.seq, page = from === null ? '' : L.param + '=' + from + '&';
+    return fetch(L.url + '?' + page + 'q=' + encodeURIComponent(L.q)).then(function(r){return r.json()}).then(function(d){
+        if (seq !== L.seq) return null;  // a newer search superseded this request
+        if (d.error) throw new Error(d.error);
+        return d;
+    });
+}
+function loadMore(id) {
+    var L = LISTS[id];
+    if (L.next === null || L.loading) return;
+    L.loading = true;
+    fetchPage(id, L.next).then(function(d){
+        L.loading = false;
+        if (!d) return;
+        L.next = d['next_' + L.param]; appendRows(id, d[L.key]); watchSentinel(id);
+    }).catch(function(){ L.loading = false; toast('Error loading more'); });
+}
+function searchList(id, q) {
+    var L = LISTS[id], s = q.trim().toLowerCase();
+    // Filter the rows already on screen right away, then ask the server for
+    // the full result once typing pauses.
+    for (var i = 0; i < L.index.length; i++) L.index[i].el.style.display = L.index[i].key.indexOf(s) !== -1 ? '' : 'none';
+    clearTimeout(L.timer);
+    L.timer = setTimeout(function() {
+        L.q = q.trim(); L.next = null; L.loading = false;
+        fetchPage(id, null).then(function(d){ if (d) renderList(id, d[L.key], d['next_' + L.param]); })
+            .catch(function(){ toast('Search error'); });
+    }, SEARCH_DEBOUNCE_MS);
+}
+// After add/edit/delete the server sends fresh stats and the competitor's
+// row, and the lists are patched in place instead of reloading the page.
+// Offset-paged lists shift their next offset with every row added or removed.
+function dropRows(id, match) {
+    var L = LISTS[id], removed = 0;
+    L.index = L.index.filter(function(e) {
+        if (!match(e.el)) return true;
+        e.el.remove(); removed++; return false;
+    });
+    if (L.next !== null && L.param === 'offset') L.next = Math.max(0, L.next - removed);
+    if (removed && !L.index.length && L.next === null) document.getElementById(id).appendChild(el('div', 'empty', L.q ? 'No matches.' : L.empty));
+}
+function putCompRow(cols, oldName) {
+    var L = LISTS['comp-list'], list = document.getElementById('comp-list');
+    if (oldName !== null) dropRows('comp-list', function(r){ return r.dataset.name === oldName; });
+    if (!cols.name.length) return;
+    var name = cols.name[0], key = L.searchKey(cols, 0).toLowerCase();
+    if (L.q && key.indexOf(L.q.toLowerCase()) === -1) return;
+    // The list is sorted by name; a row past the loaded window arrives with a later page
+    var at = 0;
+    while (at < L.index.length && L.index[at].el.dataset.name < name) at++;
+    if (at === L.index.length && L.next !== null) return;
+    var row = L.build(cols, 0), empty = list.querySelector('.empty');
+    if (empty) empty.remove();
+    list.insertBefore(row, at < L.index.length ? L.index[at].el : null);
+    L.index.splice(at, 0, {el: row, key: key});
+    if (L.next !== null) L.next++;
+}
+function renameChangeRows(oldName, newName) {
+    LISTS['ch-list'].index.forEach(function(e) {
+        if (e.el.dataset.comp !== oldName) return;
+        e.el.dataset.comp = newName; e.el.querySelector('.ch-name').textContent = newName;
+        e.key = (newName + '\n' + e.el.dataset.desc).toLowerCase();
+    });
+}
+function loadDashboard() {
+    fetch('/api/bootstrap').then(function(r){return r.json()}).then(function(d){
+        if (d.error) { toast('Error: '+d.error); return; }
+        // Bootstrap lists are unfiltered, so drop any search in progress
+        Object.keys(LISTS).forEach(function(id){ clearTimeout(LISTS[id].timer); LISTS[id].q = ''; });
+        document.getElementById('comp-search').value = document.getElementById('ch-search').value = '';
+        renderStats(d.stats);
+        renderList('comp-list', d.competitors, d.next_pages.competitors);
+        renderList('ch-list', d.changes, d.next_pages.changes);
+    }).catch(function(){toast('Error loading dashboard');});
+}
 var _delTarget=null;
 function confirmDelete(name) { _delTarget=name; document.getElementById('del-name').textContent='"'+name+'"'; openModal('del-overlay'); }
 document.addEventListener('DOMContentLoaded',function(){
+    if ('IntersectionObserver' in window) {
+        listObserver = new IntersectionObserver(function(entries){
+            entries.forEach(function(e){ if (e.isIntersecting) loadMore(e.target.dataset.list); });
+        }, {rootMargin: '200px'});
+    }
+    document.getElementById('add-pages').appendChild(newPage(1, null, false));
+    loadDashboard();
     document.getElementById('del-confirm-btn').addEventListener('click',function(){
         if (!_delTarget) return;
         var n=_delTarget, btn=this;
         btn.textContent='Deleting...'; btn.disabled=true;
         fetch('/api/competitor?name='+encodeURIComponent(n),{method:'DELETE'}).then(function(r){return r.json()}).then(function(d){
             closeModal('del-overlay'); toast(d.message);
-            if (d.success) setTimeout(function(){location.reload();},900);
+            if (!d.success) return;
+            renderStats(d.stats);
+            dropRows('comp-list', function(r){ return r.dataset.name === n; });
+            dropRows('ch-list', function(r){ return r.dataset.comp === n; });
         }).catch(function(){toast('Error deleting');}).finally(function(){btn.textContent='Delete';btn.disabled=false;_delTarget=null;});
     });
 });
+function downloadReport(btn) {
+    var label=btn.textContent, done=function(){btn.disabled=false;btn.textContent=label;};
+    btn.disabled=true; btn.textContent='Generating...';
+    fetch('/api/report?days=30').then(function(r){return r.json()}).then(function(d){
+        if (!d.job_id) { toast('Error: '+(d.error||'report failed')); done(); return; }
+        var poll=function(){
+            fetch('/api/report/'+d.job_id).then(function(r){
+                if (r.status===202) { setTimeout(poll,1000); return; }
+                if (!r.ok) throw new Error(r.status);
+                var m=/filename=([^;]+)/.exec(r.headers.get('Content-Disposition')||'');
+                return r.blob().then(function(b){
+                    var a=document.createElement('a'); a.href=URL.createObjectURL(b);
+                    a.download=m?m[1]:'competitor-report.pdf';
+                    document.body.appendChild(a); a.click(); a.remove();
+                    setTimeout(function(){URL.revokeObjectURL(a.href);},1000);
+                    done();
+                });
+            }).catch(function(){toast('Report error');done();});
+        };
+        poll();
+    }).catch(function(){toast('Report error');done();});
+}
 function runScraper(btn) {
+    var fail=function(){toast('Scraper error');btn.disabled=false;btn.textContent='Run Scraper Now';};
     btn.disabled=true; btn.textContent='Running...'; toast('Scraper started...',5000);
     fetch('/api/scrape',{method:'POST'}).then(function(r){return r.json()}).then(function(d){
-        toast('Done! '+d.changes_detected+' change(s)',4000);
-        var b=document.getElementById('scrape-banner'); b.textContent='Scraping complete - '+d.changes_detected+' change(s) detected.'; b.classList.add('show');
-        btn.textContent='Done!'; setTimeout(function(){location.reload();},2000);
-    }).catch(function(){toast('Scraper error');btn.disabled=false;btn.textContent='Run Scraper Now';});
+        if (!d.job_id) { fail(); return; }
+        var poll=function(){
+            fetch('/api/scrape/'+d.job_id).then(function(r){
+                if (r.status===202) { setTimeout(poll,2000); return; }
+                return r.json().then(function(res){
+                    if (!res.success) { fail(); return; }
+                    toast('Done! '+res.changes_detected+' change(s)',4000);
+                    var b=document.getElementById('scrape-banner'); b.textContent='Scraping complete - '+res.changes_detected+' change(s) detected.'; b.classList.add('show');
+                    btn.textContent='Run Scraper Now'; btn.disabled=false; loadDashboard();
+                });
+            }).catch(fail);
+        };
+        poll();
+    }).catch(fail);
 }
 """
 
+STATIC_MAX_AGE = 86400
+# URLs carrying the asset's fingerprint (?v=<etag prefix>) never change content
+IMMUTABLE_MAX_AGE = 31536000
+
+
+def build_static_asset(text):
+    """Encode and gzip a static asset once; returns (raw, gzipped, etag)."""
+    raw = text.encode('utf-8')
+    return raw, gzip.compress(raw, 9), hashlib.md5(raw).hexdigest()
+
+
+def static_asset_response(asset, mimetype, max_age=STATIC_MAX_AGE):
+    """Serve a prebuilt asset, honouring If-None-Match and Accept-Encoding."""
+    raw, gz, etag = asset
+    immutable = max_age > 0 and request.args.get('v') == etag[:12]
+    use_gzip = request.accept_encodings['gzip'] > 0
+    if use_gzip:
+        etag += '-gz'
+    if request.if_none_match.contains(etag):
+        resp = Response(status=304)
+    elif use_gzip:
+        resp = Response(gz, mimetype=mimetype)
+        resp.headers['Content-Encoding'] = 'gzip'
+    else:
+        resp = Response(raw, mimetype=mimetype)
+    resp.set_etag(etag)
+    resp.vary.add('Accept-Encoding')
+    resp.cache_control.public = True
+    resp.cache_control.max_age = IMMUTABLE_MAX_AGE if immutable else max_age
+    if immutable:
+        resp.cache_control.immutable = True
+    return resp
+
+
+def conditional_json(payload):
+    """jsonify() with a content ETag; a matching If-None-Match gets an empty 304."""
+    resp = jsonify(payload)
+    return make_revalidated(resp, hashlib.md5(resp.get_data()).hexdigest())
+
+
+def make_revalidated(resp, etag):
+    resp.set_etag(etag)
+    # no-cache: the browser always revalidates, so edits show up immediately
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp.make_conditional(request)
+
+
+APP_JS_ASSET = build_static_asset(APP_JS)
+
 # ============================================================
-# HTML TEMPLATE
+# STYLES
 # ============================================================
-HTML = """<!DOCTYPE html>
-<html lang="en">
-<head>
-<title>Competitor Intelligence Dashboard</title>
-<meta name="viewport" content="width=device-width, initial-scale=1.0">
-<style>
-*{margin:0;padding:0;box-sizing:border-box}
+APP_CSS = r"""*{margin:0;padding:0;box-sizing:border-box}
 body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;background:#f5f7fa;color:#2c3e50}
 .header{background:linear-gradient(135deg,#667eea,#764ba2);color:#fff;padding:2rem}
 .header h1{font-size:1.8rem;margin-bottom:.25rem}
@@ -309,9 +697,15 @@ label{display:block;font-weight:600;font-size:.88rem;margin-bottom:.4rem;color:#
 .ch-desc{font-size:.9rem;color:#444;margin-bottom:.35rem}
 .ch-url{font-size:.8rem;color:#667eea;text-decoration:none}
 .ch-url:hover{text-decoration:underline}
+.ch-more{margin-left:1rem;border:none;background:none;color:#7f8c8d;font-size:.78rem;cursor:pointer;padding:0}
+.ch-more:hover{color:#667eea}
+.ch-content{margin-top:.6rem}
+.ch-content-label{font-size:.72rem;font-weight:700;color:#95a5a6;text-transform:uppercase;margin:.4rem 0 .2rem}
+.ch-content pre{background:#fff;border:1px solid #e0e0e0;border-radius:6px;padding:.5rem .75rem;font-size:.78rem;white-space:pre-wrap;word-break:break-all;max-height:240px;overflow:auto}
 .search-bar{padding:.7rem 1rem;border:2px solid #e0e0e0;border-radius:8px;font-size:.95rem;width:100%;margin-bottom:1rem}
 .search-bar:focus{outline:none;border-color:#667eea}
 .empty{text-align:center;padding:3rem;color:#bbb;font-size:.95rem}
+.list-more{height:1px}
 .alert{padding:.9rem 1.1rem;border-radius:8px;margin-bottom:1rem;font-size:.9rem;display:none}
 .alert.ok{background:#d4edda;color:#155724;border:1px solid #c3e6cb;display:block}
 .alert.err{background:#f8d7da;color:#721c24;border:1px solid #f5c6cb;display:block}
@@ -325,190 +719,325 @@ label{display:block;font-weight:600;font-size:.88rem;margin-bottom:.4rem;color:#
 .toast.show{opacity:1}
 .banner{padding:1rem 1.25rem;border-radius:8px;margin-bottom:1rem;font-size:.9rem;background:#e8f5e9;color:#1b5e20;border:1px solid #a5d6a7;display:none}
 .banner.show{display:block}
-</style>
-</head>
-<body>
-<div class="header"><div class="container"><h1>Competitor Intelligence</h1><p>SaaS tracker &mdash; Pricing &middot; Features &middot; Blog</p></div></div>
-<div class="tabs">
-  <button class="tab active" onclick="showPane('overview',this)">Overview</button>
-  <button class="tab" onclick="showPane('competitors',this)">Competitors</button>
-  <button class="tab" onclick="showPane('changes',this)">Changes</button>
-</div>
-<div class="container">
-  <div id="overview" class="pane active">
-    <div class="grid">
-      <div class="card"><h3>Competitors</h3><div class="val">{{ stats.total_competitors }}</div></div>
-      <div class="card"><h3>Total Changes</h3><div class="val">{{ stats.total_changes }}</div></div>
-      <div class="card"><h3>Last 7 Days</h3><div class="val">{{ stats.recent_changes }}</div></div>
-      <div class="card"><h3>Most Active</h3><div class="val sm">{{ stats.most_active_competitor or 'N/A' }}</div></div>
-    </div>
-    <div class="box"><h2>Actions</h2>
-      <div id="scrape-banner" class="banner"></div>
-      <div class="actions">
-        <button class="btn" onclick="runScraper(this)">Run Scraper Now</button>
-        <button class="btn" onclick="window.open('/api/report?days=30')">Download PDF Report</button>
-        <button class="btn grey" onclick="location.reload()">Refresh</button>
-      </div>
-    </div>
-  </div>
-  <div id="competitors" class="pane">
-    <div class="box"><h2>Add Competitor</h2>
-      <div id="add-msg" class="alert"></div>
-      <form onsubmit="addComp(event)">
-        <div class="fg"><label>Competitor Name *</label><input type="text" id="c-name" required placeholder="e.g. Acme Corp"></div>
-        <div class="fg"><label>Website</label><input type="url" id="c-website" placeholder="https://example.com"></div>
-        <div id="add-pages">
-          <div class="page-block">
-            <div class="page-block-header"><span>Page 1</span></div>
-            <div class="fg"><label>URL *</label><input type="url" class="p-url" required placeholder="https://example.com/pricing"></div>
-            <div class="fg"><label>Type *</label><select class="p-type"><option value="pricing">Pricing</option><option value="features">Features</option><option value="blog">Blog</option><option value="other">Other</option></select></div>
-            <div class="fg"><label>CSS Selector (optional)</label><input type="text" class="p-sel" placeholder="Leave empty for automatic detection"></div>
-          </div>
-        </div>
-        <div class="actions">
-          <button type="button" class="btn grey sm" onclick="addPageBlock('add-pages')">+ Add Page</button>
-          <button type="submit" class="btn green">Save Competitor</button>
-        </div>
-      </form>
-    </div>
-    <div class="box"><h2>Your Competitors</h2>
-      <input class="search-bar" id="comp-search" placeholder="Search competitors..." oninput="filterComps()">
-      <div id="comp-list">
-        {% if competitors %}
-          {% for c in competitors %}
-          <div class="comp-row" data-name="{{ c.name }}">
-            <div class="comp-info">
-              <h3>{{ c.name }}</h3>
-              <div class="comp-meta">
-                <span>{{ c.page_count }} pages</span>
-                <span>{{ c.change_count }} changes</span>
-                {% if c.last_scraped %}<span>Last: {{ c.last_scraped[:16] }}</span>{% endif %}
-              </div>
-            </div>
-            <div class="btn-group">
-              <button class="btn sm" onclick="viewComp(this.dataset.name)" data-name="{{ c.name }}">View</button>
-              <button class="btn sm grey" onclick="editComp(this.dataset.name)" data-name="{{ c.name }}">Edit</button>
-              <button class="btn sm red" onclick="confirmDelete(this.dataset.name)" data-name="{{ c.name }}">Delete</button>
-            </div>
-          </div>
-          {% endfor %}
-        {% else %}<div class="empty">No competitors yet &mdash; add your first one above!</div>
-        {% endif %}
-      </div>
-    </div>
-  </div>
-  <div id="changes" class="pane">
-    <div class="box"><h2>Recent Changes</h2>
-      <input class="search-bar" id="ch-search" placeholder="Search by competitor or description..." oninput="filterChanges()">
-      <div id="ch-list">
-        {% if changes %}
-          {% for ch in changes %}
-          <div class="change-row" data-comp="{{ ch.competitor_name }}" data-desc="{{ ch.change_description }}">
-            <div class="ch-header">
-              <div><span class="ch-name">{{ ch.competitor_name }}</span><span class="badge {{ ch.page_type }}">{{ ch.page_type }}</span></div>
-              <span class="ch-time">{{ ch.detected_at[:16] if ch.detected_at else '' }}</span>
-            </div>
-            <div class="ch-desc">{{ ch.change_description }}</div>
-            <a class="ch-url" href="{{ ch.page_url }}" target="_blank">{{ ch.page_url }}</a>
-          </div>
-          {% endfor %}
-        {% else %}<div class="empty">No changes yet &mdash; run the scraper!</div>
-        {% endif %}
-      </div>
-    </div>
-  </div>
-</div>
-<div class="overlay" id="view-overlay">
-  <div class="modal"><button class="modal-close" onclick="closeModal('view-overlay')">&times;</button><h2>Competitor Details</h2><div id="view-body"></div></div>
-</div>
-<div class="overlay" id="edit-overlay">
-  <div class="modal"><button class="modal-close" onclick="closeModal('edit-overlay')">&times;</button><h2>Edit Competitor</h2>
-    <form onsubmit="saveEdit(event)">
-      <input type="hidden" id="e-orig">
-      <div class="fg"><label>Name *</label><input type="text" id="e-name" required></div>
-      <div class="fg"><label>Website</label><input type="url" id="e-website"></div>
-      <div id="edit-pages"></div>
-      <div class="actions">
-        <button type="button" class="btn grey sm" onclick="addPageBlock('edit-pages')">+ Add Page</button>
-        <button type="submit" class="btn green">Save Changes</button>
-        <button type="button" class="btn grey sm" onclick="closeModal('edit-overlay')">Cancel</button>
-      </div>
-    </form>
-  </div>
-</div>
-<div class="overlay" id="del-overlay">
-  <div class="modal" style="max-width:400px;text-align:center">
-    <button class="modal-close" onclick="closeModal('del-overlay')">&times;</button>
-    <h2 style="color:#e74c3c">Delete Competitor</h2>
-    <p style="margin:1rem 0 2rem;color:#666">Permanently delete <strong id="del-name"></strong> and all its data.</p>
-    <div class="actions" style="justify-content:center">
-      <button class="btn grey" onclick="closeModal('del-overlay')">Cancel</button>
-      <button class="btn red" id="del-confirm-btn">Delete</button>
-    </div>
-  </div>
-</div>
-<div class="toast" id="toast"></div>
-<script src="/static/app.js"></script>
-</body>
-</html>"""
+"""
+
+APP_CSS_ASSET = build_static_asset(APP_CSS)
+
+# ============================================================
+# PAGE SHELL (templates/dashboard.html)
+# ============================================================
+# The page is a static shell: rendered once at import, data comes from /api/bootstrap
+INDEX_ASSET = build_static_asset(
+    app.jinja_env.get_template('dashboard.html').render(js_version=APP_JS_ASSET[2][:12],
+                                                        css_version=APP_CSS_ASSET[2][:12]))
 
 
 # ============================================================
 # ROUTES
 # ============================================================
+COMPETITOR_FIELDS = ('name', 'page_count', 'change_count', 'last_scraped')
+CHANGE_FIELDS = ('id', 'competitor_name', 'page_type', 'change_description', 'page_url', 'detected_at')
+
+
+def to_columns(rows, fields):
+    """Turn a list of row dicts into {field: [values...]} for the client."""
+    return {f: [r.get(f) for r in rows] for f in fields}
+
+
+# (epoch second, ISO timestamp, YYYY-MM-DD), reformatted at most once a second
+_clock = (0, '', '')
+
+
+def cached_now():
+    """Return (iso_timestamp, date_string) for the current second."""
+    global _clock
+    sec = int(time.time())
+    if sec != _clock[0]:
+        now = datetime.fromtimestamp(sec)
+        _clock = (sec, now.isoformat(), now.strftime('%Y-%m-%d'))
+    return _clock[1], _clock[2]
+
+
+# Recent-changes queries keyed by (limit, days), reused for RECENT_CHANGES_TTL
+# seconds so back-to-back report downloads and dashboard reloads don't repeat
+# the same SELECT. An entry only counts while the change window's signature
+# (see CompetitorDB.get_change_window_signature) still matches, so new,
+# deleted, aged-out or renamed changes are never served from it.
+RECENT_CHANGES_TTL = 30
+RECENT_CHANGES_CACHE_SIZE = 32
+_recent_changes_cache = {}
+_recent_changes_lock = threading.Lock()
+
+
+def get_recent_changes_cached(limit, days, signature):
+    key = (limit, days)
+    now = time.monotonic()
+    with _recent_changes_lock:
+        hit = _recent_changes_cache.get(key)
+        if hit and now - hit[0] < RECENT_CHANGES_TTL and hit[1] == signature:
+            return hit[2]
+    changes = db.get_recent_changes(limit=limit, days=days, summary_only=True)
+    with _recent_changes_lock:
+        if key not in _recent_changes_cache and len(_recent_changes_cache) >= RECENT_CHANGES_CACHE_SIZE:
+            _recent_changes_cache.pop(min(_recent_changes_cache, key=lambda k: _recent_changes_cache[k][0]))
+        _recent_changes_cache[key] = (now, signature, changes)
+    return changes
+
+
+def paged_columns(rows, fields, offset, limit):
+    """Columns for up to `limit` rows plus the next page's offset (None on the last page).
+    Callers fetch limit + 1 rows so a further page can be detected without a COUNT."""
+    next_offset = offset + limit if len(rows) > limit else None
+    return to_columns(rows[:limit], fields), next_offset
+
+
+def keyset_columns(rows, fields, limit):
+    """Like paged_columns, but the next page is keyed by the last row's id."""
+    next_before = rows[limit - 1]['id'] if len(rows) > limit else None
+    return to_columns(rows[:limit], fields), next_before
+
+
+def load_dashboard_data():
+    """Collect stats and the first page of competitors and recent changes."""
+    fetch = LIST_PAGE_SIZE + 1
+    try:
+        bundle = db.get_dashboard_bundle(days=DEFAULT_DAYS_LOOKBACK, competitor_limit=fetch)
+    except Exception as e:
+        logger.warning(f"Using fallback competitors list: {e}")
+        bundle = {'stats': db.get_competitor_stats(),
+                  'competitors': db.get_all_competitors()[:fetch],
+                  'change_window': db.get_change_window_signature(DEFAULT_DAYS_LOOKBACK)}
+    recent = get_recent_changes_cached(fetch, DEFAULT_DAYS_LOOKBACK, bundle['change_window'])
+    competitors, competitors_next = paged_columns(bundle['competitors'], COMPETITOR_FIELDS, 0, LIST_PAGE_SIZE)
+    changes, changes_next = keyset_columns(recent, CHANGE_FIELDS, LIST_PAGE_SIZE)
+    return {'stats': bundle['stats'],
+            'competitors': competitors,
+            'changes': changes,
+            'next_pages': {'competitors': competitors_next, 'changes': changes_next}}
+
+
+class DashboardSnapshot:
+    """Last dashboard payload, serialized once and shared by every request thread."""
+    __slots__ = ('body', 'etag', 'ts')
+
+    def __init__(self):
+        self.body = None
+        self.etag = None
+        self.ts = 0.0
+
+
+# Requests read the snapshot; it is rebuilt at most every SNAPSHOT_TTL seconds
+# and dropped whenever competitors change or a scrape finishes.
+SNAPSHOT_TTL = 5
+_snapshot = DashboardSnapshot()
+_snapshot_lock = threading.RLock()
+
+
+def get_dashboard_snapshot():
+    """Return (json_body, etag) for the current dashboard data."""
+    with _snapshot_lock:
+        if _snapshot.body is None or time.monotonic() - _snapshot.ts >= SNAPSHOT_TTL:
+            body = app.json.dumps(load_dashboard_data()).encode('utf-8')
+            _snapshot.body = body
+            _snapshot.etag = hashlib.md5(body).hexdigest()
+            _snapshot.ts = time.monotonic()
+        return _snapshot.body, _snapshot.etag
+
+
+def invalidate_caches():
+    """Drop cached dashboard data after competitors change or a scrape runs."""
+    with _recent_changes_lock:
+        _recent_changes_cache.clear()
+    with _snapshot_lock:
+        _snapshot.body = None
+
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def add_server_timing(resp):
+    # Shows up per request in the browser's network panel
+    started = g.pop('request_started', None)
+    if started is not None:
+        resp.headers['Server-Timing'] = f'app;dur={(time.perf_counter() - started) * 1000:.1f}'
+    return resp
+
+
 @app.route('/')
 def index():
+    return static_asset_response(INDEX_ASSET, 'text/html', max_age=0)
+
+
+@app.route('/api/bootstrap')
+def api_bootstrap():
     try:
-        stats = db.get_competitor_stats()
-        changes = db.get_recent_changes(limit=DEFAULT_CHANGE_LIMIT, days=DEFAULT_DAYS_LOOKBACK)
-        try:
-            competitors_raw = db.get_all_competitors_from_db()
-            competitors = []
-            for comp in competitors_raw:
-                with db.get_connection() as conn:
-                    cursor = conn.cursor()
-                    cursor.execute('SELECT MAX(scraped_at) FROM snapshots WHERE competitor_name = ?', (comp['name'],))
-                    last_scraped = cursor.fetchone()[0]
-                    cursor.execute('SELECT COUNT(*) FROM changes WHERE competitor_name = ?', (comp['name'],))
-                    change_count = cursor.fetchone()[0]
-                competitors.append({'name': comp['name'], 'page_count': len(comp.get('pages', [])), 'last_scraped': last_scraped, 'change_count': change_count})
-        except Exception as e:
-            logger.warning(f"Using fallback competitors list: {e}")
-            competitors = db.get_all_competitors()
-        return render_template_string(HTML, stats=stats, changes=changes, competitors=competitors)
+        body, etag = get_dashboard_snapshot()
+        return make_revalidated(Response(body, mimetype='application/json'), etag)
     except Exception as e:
         logger.error(f"Error loading dashboard: {e}", exc_info=True)
-        return f"<h2>Error loading dashboard</h2><pre>{e}</pre>", 500
+        return jsonify({'error': 'Internal server error'}), 500
 
 
 @app.route('/static/app.js')
 def serve_js():
-    return Response(APP_JS, mimetype='application/javascript')
+    return static_asset_response(APP_JS_ASSET, 'application/javascript')
+
+
+@app.route('/static/app.css')
+def serve_css():
+    return static_asset_response(APP_CSS_ASSET, 'text/css')
+
+
+# Scrapes run on a single background worker and are polled by job id. A scrape
+# requested while one is in flight joins it instead of fetching every page again.
+_scrape_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scrape')
+_scrape_lock = threading.Lock()
+_scrape_jobs = {}  # job_id -> future, most recent last
+_scrape_current = None  # job_id of the run in flight
+MAX_SCRAPE_JOBS = 20
+
+
+def run_scrape():
+    try:
+        return scraper.scrape_all_competitors()
+    finally:
+        invalidate_caches()
+
+
+def start_scrape():
+    """Return the id of the running scrape, starting one if none is in flight."""
+    global _scrape_current
+    with _scrape_lock:
+        current = _scrape_jobs.get(_scrape_current)
+        if current is not None and not current.done():
+            return _scrape_current
+        job_id = uuid.uuid4().hex
+        _scrape_jobs[job_id] = _scrape_pool.submit(run_scrape)
+        _scrape_current = job_id
+        while len(_scrape_jobs) > MAX_SCRAPE_JOBS:
+            del _scrape_jobs[next(iter(_scrape_jobs))]
+        return job_id
 
 
 @app.route('/api/scrape', methods=['POST'])
 def api_scrape():
+    return jsonify({'job_id': start_scrape(), 'status': 'running'}), 202
+
+
+@app.route('/api/scrape/<job_id>')
+def api_scrape_status(job_id):
+    with _scrape_lock:
+        future = _scrape_jobs.get(job_id)
+    if future is None:
+        return jsonify({'error': 'Unknown scrape job'}), 404
+    if not future.done():
+        return jsonify({'status': 'running'}), 202
     try:
-        n = scraper.scrape_all_competitors()
-        return jsonify({'success': True, 'changes_detected': n})
+        n = future.result()
+        return jsonify({'status': 'done', 'success': True, 'changes_detected': n})
     except Exception as e:
         logger.error(f"Scraping error: {e}", exc_info=True)
-        return jsonify({'success': False, 'error': str(e), 'changes_detected': 0}), 500
+        return jsonify({'status': 'failed', 'success': False, 'error': str(e), 'changes_detected': 0}), 500
 
 
 @app.route('/api/report')
 def api_report():
+    days = request.args.get('days', DEFAULT_DAYS_LOOKBACK, type=int)
+    if days < 1 or days > 365:
+        return jsonify({'error': 'Invalid days parameter'}), 400
+    full = request.args.get('full') == '1'
+    reap_report_jobs()
+    job_id = uuid.uuid4().hex
+    future = _report_pool.submit(build_report, days, full)
+    with _report_jobs_lock:
+        _report_jobs[job_id] = (future, time.monotonic())
+    return jsonify({'job_id': job_id}), 202
+
+
+@app.route('/api/report/<job_id>')
+def api_report_result(job_id):
+    with _report_jobs_lock:
+        job = _report_jobs.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Unknown report job'}), 404
+        future, _ = job
+        if not future.done():
+            return jsonify({'status': 'pending'}), 202
     try:
-        days = request.args.get('days', DEFAULT_DAYS_LOOKBACK, type=int)
-        if days < 1 or days > 365:
-            return "Invalid days parameter", 400
-        changes = db.get_recent_changes(limit=200, days=days)
-        pdf_bytes = generate_pdf_report(changes, days)
-        return Response(pdf_bytes, mimetype='application/pdf',
-            headers={'Content-Disposition': f'attachment; filename=competitor-report-{datetime.now().strftime("%Y-%m-%d")}.pdf'})
+        path = future.result()
     except Exception as e:
+        with _report_jobs_lock:
+            _report_jobs.pop(job_id, None)
         logger.error(f"Report error: {e}", exc_info=True)
-        return "Failed to generate report", 500
+        return jsonify({'error': 'Failed to generate report'}), 500
+    try:
+        # send_file opens the PDF right away, so it may be pruned once this returns
+        return send_file(path, mimetype='application/pdf', as_attachment=True,
+                         download_name=f'competitor-report-{cached_now()[1]}.pdf', max_age=0)
+    except FileNotFoundError:
+        # Uncollected reports are never pruned, so something else removed it
+        logger.error(f"Report file missing: {path}")
+        return jsonify({'error': 'Failed to generate report'}), 500
+    finally:
+        with _report_jobs_lock:
+            _report_jobs.pop(job_id, None)
+
+
+def page_args():
+    """Read offset/limit/q list paging arguments from the query string."""
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', LIST_PAGE_SIZE, type=int), 1), MAX_PAGE_SIZE)
+    q = sanitize_string(request.args.get('q', ''), max_length=100) or None
+    return offset, limit, q
+
+
+@app.route('/api/competitors', methods=['GET'])
+def api_list_competitors():
+    offset, limit, q = page_args()
+    try:
+        rows = db.get_competitor_summaries(offset=offset, limit=limit + 1, q=q)
+        cols, next_offset = paged_columns(rows, COMPETITOR_FIELDS, offset, limit)
+        return jsonify({'competitors': cols, 'next_offset': next_offset})
+    except Exception as e:
+        logger.error(f"Error listing competitors: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+@app.route('/api/changes')
+def api_list_changes():
+    _, limit, q = page_args()
+    before_id = request.args.get('before', type=int)
+    try:
+        rows = db.get_recent_changes(limit=limit + 1, days=DEFAULT_DAYS_LOOKBACK, q=q,
+                                     before_id=before_id, summary_only=True)
+        cols, next_before = keyset_columns(rows, CHANGE_FIELDS, limit)
+        return jsonify({'changes': cols, 'next_before': next_before})
+    except Exception as e:
+        logger.error(f"Error listing changes: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
+
+
+def competitor_patch(name):
+    """Fresh stats plus the competitor's list row, so the page can update in place."""
+    summary = db.get_competitor_summary(name)
+    return {'stats': db.get_competitor_stats(),
+            'competitor': to_columns([summary] if summary else [], COMPETITOR_FIELDS)}
+
+
+@app.route('/api/change/<int:change_id>')
+def api_get_change(change_id):
+    """Full old/new content for one change; change lists leave it out."""
+    try:
+        change = db.get_change(change_id)
+        if change is None:
+            return jsonify({'error': 'Change not found'}), 404
+        return conditional_json(change)
+    except Exception as e:
+        logger.error(f"Error getting change {change_id}: {e}", exc_info=True)
+        return jsonify({'error': 'Internal server error'}), 500
 
 
 @app.route('/api/competitors', methods=['POST'])
@@ -523,23 +1052,16 @@ def api_add():
         website = sanitize_string(data.get('website', '')).strip()
         if website and not validate_url(website):
             return jsonify({'success': False, 'message': 'Invalid website URL'}), 400
-        pages = data.get('pages', [])
-        if not isinstance(pages, list) or len(pages) == 0:
-            return jsonify({'success': False, 'message': 'At least one page is required'}), 400
-        validated_pages = []
-        for idx, page in enumerate(pages):
-            page_url = sanitize_string(page.get('url', '')).strip()
-            if not validate_url(page_url):
-                return jsonify({'success': False, 'message': f'Invalid URL for page {idx+1}'}), 400
-            page_type = page.get('type', 'other')
-            if not validate_page_type(page_type):
-                return jsonify({'success': False, 'message': f'Invalid page type for page {idx+1}'}), 400
-            validated_pages.append({'url': page_url, 'type': page_type, 'selector': sanitize_string(page.get('selector', ''), max_length=500)})
+        validated_pages = validate_pages(data.get('pages'))
         success = db.add_competitor(name, website, validated_pages)
         if success:
-            return jsonify({'success': True, 'message': f'"{name}" added successfully!'})
+            invalidate_caches()
+            return jsonify({'success': True, 'message': f'"{name}" added successfully!',
+                            **competitor_patch(name)})
         else:
             return jsonify({'success': False, 'message': f'"{name}" already exists'})
+    except ValidationError as e:
+        return jsonify({'success': False, 'message': e.message}), 400
     except Exception as e:
         logger.error(f"Error adding competitor: {e}", exc_info=True)
         return jsonify({'success': False, 'message': 'Internal server error'}), 500
@@ -553,9 +1075,9 @@ def api_get():
     try:
         comp = db.get_competitor_by_name(name)
         if comp:
-            return jsonify(comp)
+            return conditional_json(comp)
         pages = db.get_competitor_pages(name)
-        return jsonify({'name': name, 'website': '', 'pages': pages})
+        return conditional_json({'name': name, 'website': '', 'pages': pages})
     except Exception as e:
         logger.error(f"Error getting competitor {name}: {e}", exc_info=True)
         return jsonify({'error': 'Internal server error'}), 500
@@ -577,21 +1099,16 @@ def api_update():
         website = sanitize_string(data.get('website', '')).strip()
         if website and not validate_url(website):
             return jsonify({'success': False, 'message': 'Invalid website URL'}), 400
-        pages = data.get('pages', [])
-        if not isinstance(pages, list) or len(pages) == 0:
-            return jsonify({'success': False, 'message': 'At least one page required'}), 400
-        validated_pages = []
-        for page in pages:
-            if not validate_url(page.get('url', '')):
-                return jsonify({'success': False, 'message': 'Invalid page URL'}), 400
-            if not validate_page_type(page.get('type', '')):
-                return jsonify({'success': False, 'message': 'Invalid page type'}), 400
-            validated_pages.append({'url': page['url'], 'type': page['type'], 'selector': sanitize_string(page.get('selector', ''), max_length=500)})
+        validated_pages = validate_pages(data.get('pages'))
         success = db.update_competitor(orig, new_name, website, validated_pages)
         if success:
-            return jsonify({'success': True, 'message': f'"{new_name}" updated!'})
+            invalidate_caches()
+            return jsonify({'success': True, 'message': f'"{new_name}" updated!',
+                            **competitor_patch(new_name)})
         else:
             return jsonify({'success': False, 'message': 'Competitor not found'})
+    except ValidationError as e:
+        return jsonify({'success': False, 'message': e.message}), 400
     except Exception as e:
         logger.error(f"Error updating competitor: {e}", exc_info=True)
         return jsonify({'success': False, 'message': 'Internal server error'}), 500
@@ -605,7 +1122,9 @@ def api_delete():
     try:
         success = db.delete_competitor_from_db(name)
         if success:
-            return jsonify({'success': True, 'message': f'"{name}" deleted.'})
+            invalidate_caches()
+            return jsonify({'success': True, 'message': f'"{name}" deleted.',
+                            'stats': db.get_competitor_stats()})
         else:
             return jsonify({'success': False, 'message': f'"{name}" not found.'})
     except Exception as e:
@@ -615,7 +1134,7 @@ def api_delete():
 
 @app.route('/health')
 def health_check():
-    return jsonify({'status': 'healthy', 'timestamp': datetime.now().isoformat()})
+    return jsonify({'status': 'healthy', 'timestamp': cached_now()[0]})
 
 
 @app.errorhandler(404)
@@ -628,82 +1147,106 @@ def internal_error(e): return jsonify({'error': 'Internal server error'}), 500
 # ============================================================
 # PDF GENERATION
 # ============================================================
-def generate_pdf_report(changes, days=30):
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter,
-        leftMargin=0.75*inch, rightMargin=0.75*inch,
-        topMargin=0.75*inch, bottomMargin=0.75*inch)
-    PURPLE = colors.HexColor('#667eea')
-    LIGHT  = colors.HexColor('#f0f2ff')
-    GREY   = colors.HexColor('#e0e0e0')
-    LINE   = colors.HexColor('#f0f0f0')
-    TYPE_COLORS = {
-        'pricing':  ('#e8f5e9', '#27ae60'),
-        'features': ('#e3f2fd', '#1565c0'),
-        'blog':     ('#fff3e0', '#e65100'),
-        'other':    ('#f3e5f5', '#6a1b9a'),
-    }
-    mk = lambda **kw: ParagraphStyle('_', **kw)
-    title_st   = mk(fontSize=22, fontName='Helvetica-Bold', textColor=PURPLE, spaceAfter=4)
-    sub_st     = mk(fontSize=10, fontName='Helvetica', textColor=colors.HexColor('#7f8c8d'), spaceAfter=16)
-    section_st = mk(fontSize=13, fontName='Helvetica-Bold', textColor=colors.HexColor('#2c3e50'), spaceBefore=16, spaceAfter=8)
-    desc_st    = mk(fontSize=10, fontName='Helvetica', textColor=colors.HexColor('#2c3e50'), leading=15)
-    url_st     = mk(fontSize=8, fontName='Helvetica', textColor=PURPLE)
-    footer_st  = mk(fontSize=8, textColor=colors.HexColor('#bbbbbb'), alignment=TA_CENTER)
-    count_st   = mk(fontSize=10, fontName='Helvetica', textColor=colors.HexColor('#7f8c8d'), alignment=TA_RIGHT)
-    comp_st    = mk(fontSize=12, fontName='Helvetica-Bold', textColor=colors.HexColor('#2c3e50'))
-    time_st    = mk(fontSize=8, fontName='Helvetica', textColor=colors.HexColor('#95a5a6'), alignment=TA_RIGHT)
-    story = []
-    story.append(Paragraph("Competitor Intelligence Report", title_st))
-    story.append(Paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y at %H:%M')}  |  Period: Last {days} days", sub_st))
-    story.append(HRFlowable(width="100%", thickness=2, color=PURPLE, spaceAfter=20))
-    if not changes:
-        story.append(Paragraph(f"No changes detected in the last {days} days.", mk(fontSize=11, fontName='Helvetica')))
-        doc.build(story); return buffer.getvalue()
-    by_competitor = {}
-    by_type = {}
-    for ch in changes:
-        by_competitor.setdefault(ch['competitor_name'], []).append(ch)
-        by_type[ch['page_type']] = by_type.get(ch['page_type'], 0) + 1
-    story.append(Paragraph("Summary", section_st))
-    sum_data = [
-        ['Total Changes', 'Competitors', 'Pricing', 'Features', 'Blog'],
-        [str(len(changes)), str(len(by_competitor)), str(by_type.get('pricing',0)), str(by_type.get('features',0)), str(by_type.get('blog',0))]
-    ]
-    sum_tbl = Table(sum_data, colWidths=[1.34*inch]*5)
-    sum_tbl.setStyle(TableStyle([
-        ('BACKGROUND',(0,0),(-1,0),PURPLE),('TEXTCOLOR',(0,0),(-1,0),colors.white),
-        ('FONTNAME',(0,0),(-1,0),'Helvetica-Bold'),('FONTSIZE',(0,0),(-1,0),8),
-        ('ALIGN',(0,0),(-1,-1),'CENTER'),('VALIGN',(0,0),(-1,-1),'MIDDLE'),
-        ('FONTNAME',(0,1),(-1,-1),'Helvetica-Bold'),('FONTSIZE',(0,1),(-1,-1),17),
-        ('TEXTCOLOR',(0,1),(-1,-1),colors.HexColor('#2c3e50')),
-        ('BACKGROUND',(0,1),(-1,-1),colors.HexColor('#f8f9fa')),
-        ('GRID',(0,0),(-1,-1),0.5,GREY),('TOPPADDING',(0,0),(-1,-1),10),('BOTTOMPADDING',(0,0),(-1,-1),10),
-    ]))
-    story.append(sum_tbl); story.append(Spacer(1,20))
-    story.append(Paragraph("Detailed Changes", section_st))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=GREY, spaceAfter=12))
-    for comp_name, comp_changes in by_competitor.items():
-        hdr = Table([[Paragraph(comp_name, comp_st), Paragraph(f"{len(comp_changes)} change{'s' if len(comp_changes)>1 else ''}", count_st)]], colWidths=[5*inch, 2*inch])
-        hdr.setStyle(TableStyle([('BACKGROUND',(0,0),(-1,-1),LIGHT),('TOPPADDING',(0,0),(-1,-1),8),('BOTTOMPADDING',(0,0),(-1,-1),8),('LEFTPADDING',(0,0),(-1,-1),12),('RIGHTPADDING',(0,0),(-1,-1),12),('LINEBELOW',(0,0),(-1,-1),2,PURPLE)]))
-        story.append(hdr)
-        for ch in comp_changes:
-            ptype = ch.get('page_type','other')
-            bg, fg = TYPE_COLORS.get(ptype, TYPE_COLORS['other'])
-            badge = Table([[Paragraph(ptype.upper(), mk(fontSize=7, fontName='Helvetica-Bold', textColor=colors.HexColor(fg)))]],
-                colWidths=[0.7*inch], style=TableStyle([('BACKGROUND',(0,0),(-1,-1),colors.HexColor(bg)),('TOPPADDING',(0,0),(-1,-1),4),('BOTTOMPADDING',(0,0),(-1,-1),4),('LEFTPADDING',(0,0),(-1,-1),6),('RIGHTPADDING',(0,0),(-1,-1),6)]))
-            row = Table([[badge, Paragraph(ch.get('change_description',''), desc_st), Paragraph(str(ch.get('detected_at',''))[:16], time_st)]], colWidths=[0.8*inch, 5*inch, 1.2*inch])
-            row.setStyle(TableStyle([('VALIGN',(0,0),(-1,-1),'TOP'),('TOPPADDING',(0,0),(-1,-1),10),('BOTTOMPADDING',(0,0),(-1,-1),4),('LEFTPADDING',(0,0),(-1,-1),12),('RIGHTPADDING',(0,0),(-1,-1),12)]))
-            story.append(row)
-            url_row = Table([[Paragraph('',desc_st), Paragraph(ch.get('page_url',''), url_st), Paragraph('',desc_st)]], colWidths=[0.8*inch, 5*inch, 1.2*inch])
-            url_row.setStyle(TableStyle([('TOPPADDING',(0,0),(-1,-1),0),('BOTTOMPADDING',(0,0),(-1,-1),8),('LEFTPADDING',(0,0),(-1,-1),12),('LINEBELOW',(0,0),(-1,-1),0.5,LINE)]))
-            story.append(url_row)
-        story.append(Spacer(1,14))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=GREY, spaceBefore=10))
-    story.append(Paragraph("Generated by Competitor Intelligence Dashboard", footer_st))
-    doc.build(story)
-    return buffer.getvalue()
+# Reports are built on a small worker pool so a long ReportLab layout never
+# holds a request thread; clients poll /api/report/<job_id> for the result.
+REPORT_WORKERS = 2
+# Changes listed per competitor unless the full report (?full=1) is requested
+MAX_CHANGES_PER_COMPETITOR = 25
+_report_pool = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix='report')
+_report_jobs = {}  # job_id -> (future, submitted monotonic time)
+_report_jobs_lock = threading.Lock()
+# Jobs nobody collects within this many seconds are forgotten
+REPORT_JOB_TTL = 600
+# Rendered PDFs are kept on disk, keyed by the data they were built from, so
+# asking again for an unchanged report skips ReportLab entirely
+REPORT_CACHE_DIR = os.environ.get('REPORT_CACHE_DIR', 'reports_cache')
+REPORT_CACHE_MAX_FILES = 20
+
+
+def reap_report_jobs():
+    """Forget report jobs whose result was never collected."""
+    cutoff = time.monotonic() - REPORT_JOB_TTL
+    with _report_jobs_lock:
+        for job_id in [j for j, (_, submitted) in _report_jobs.items() if submitted < cutoff]:
+            del _report_jobs[job_id]
+
+
+def report_cache_path(days, full, signature):
+    # New changes raise the max id; changes aging out of the window or being
+    # deleted lower the count; renaming a competitor changes the names tag.
+    # The date keeps the "Generated:" header and the period it covers current.
+    max_id, count, names = signature
+    variant = 'full' if full else 'top'
+    names_tag = hashlib.md5((names or '').encode('utf-8')).hexdigest()[:12]
+    return os.path.join(REPORT_CACHE_DIR,
+                        f'report-{cached_now()[1]}-{days}d-{variant}-{max_id or 0}-{count}-{names_tag}.pdf')
+
+
+def _cached_reports():
+    try:
+        return [e for e in os.scandir(REPORT_CACHE_DIR) if e.name.endswith('.pdf')]
+    except FileNotFoundError:
+        return []
+
 
+def _reports_awaiting_download():
+    """Paths of finished reports whose job hasn't been collected yet."""
+    with _report_jobs_lock:
+        futures = [future for future, _ in _report_jobs.values()]
+    return {os.path.abspath(f.result()) for f in futures
+            if f.done() and not f.cancelled() and f.exception() is None}
+
+
+def prune_report_cache(keep=REPORT_CACHE_MAX_FILES):
+    """Delete all but the `keep` most recently written cached reports.
+    Reports still waiting to be downloaded are never deleted."""
+    pinned = _reports_awaiting_download()
+    entries = sorted(_cached_reports(), key=lambda e: e.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        if os.path.abspath(entry.path) in pinned:
+            continue
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def build_report(days, full=False):
+    """Return the path of a PDF for the current data, rendering it only on a cache miss."""
+    signature = db.get_change_window_signature(days)
+    path = report_cache_path(days, full, signature)
+    if os.path.exists(path):
+        return path
+    changes = get_recent_changes_cached(200, days, signature)
+    aggregates = db.get_change_aggregates(days)
+    # ReportLab is only imported by the first report, not at startup
+    from reports import generate_pdf_report
+    os.makedirs(REPORT_CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=REPORT_CACHE_DIR, prefix='.report-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            generate_pdf_report(changes, days, out,
+                                max_per_competitor=None if full else MAX_CHANGES_PER_COMPETITOR,
+                                aggregates=aggregates)
+        os.replace(tmp, path)  # readers never see a half-written file
+    except Exception:
+        os.remove(tmp)
+        raise
+    prune_report_cache()
+    return path
+
+
+# ============================================================
+# MONITORING
+# ============================================================
+# Flask-MonitoringDashboard records latency and outliers per endpoint under
+# /dashboard. Bound last so every route above is wrapped; enabled only when
+# the package is installed and its config file exists.
+FMD_CONFIG_FILE = os.environ.get('FMD_CONFIG', 'fmd_config.cfg')
+if fmd is not None and os.path.exists(FMD_CONFIG_FILE):
+    fmd.config.init_from(file=FMD_CONFIG_FILE)
+    fmd.bind(app)
+    logger.info(f"Monitoring dashboard enabled from {FMD_CONFIG_FILE}")
 
 # ============================================================
 # MAIN
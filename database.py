@@ -6,287 +6,684 @@ Handles all database operations with proper resource management and error handli
 import sqlite3
 import json
 import logging
+import atexit
+import threading
+import weakref
+import zlib
+from itertools import groupby, islice
+from operator import itemgetter
 from datetime import datetime
 from typing import Optional, Dict, List, Any
 from contextlib import contextmanager
 
+try:
+    import orjson
+except ImportError:  # metadata goes through stdlib json instead
+    orjson = None
+try:
+    import zstandard
+except ImportError:  # snapshot content is compressed with stdlib zlib instead
+    zstandard = None
+
 logger = logging.getLogger('competitor_dashboard.database')
 
 # Constants
-MAX_CONTENT_SIZE = 1_000_000  # 1MB max content storage
+MAX_CONTENT_SIZE = 1_000_000  # Characters of page content kept per snapshot
+# Bytes a stored snapshot may take (CHECKed): MAX_CONTENT_SIZE characters of
+# UTF-8 at up to 4 bytes each, plus the compressor's worst-case framing
+MAX_CONTENT_BYTES = 4 * MAX_CONTENT_SIZE + 65536
+MMAP_SIZE = 256 * 1024 * 1024  # Map up to 256MB of the DB file for reads
+CACHE_SIZE_KIB = 64000  # Per-connection page cache (negative cache_size = KiB)
+NOTIFY_BATCH_SIZE = 500  # Change ids bound per executemany() call
+CHANGE_CONTENT_CHARS = 1000  # old/new content stored per change (CHECKed)
+ZSTD_LEVEL = 3
+ZLIB_LEVEL = 6
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'  # zstd frame header; anything else is zlib
+
+
+# Bump SCHEMA_VERSION whenever SCHEMA_SQL changes; databases stamped with an
+# older user_version re-run the (idempotent) script on next start.
+SCHEMA_VERSION = 3
+_SNAPSHOTS_COLUMNS = f'''(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    competitor_name TEXT NOT NULL,
+    page_url TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    content_hash BLOB NOT NULL,  -- raw SHA-256 digest (older rows: hex text)
+    content BLOB NOT NULL,  -- compressed UTF-8, or text when that isn't smaller
+    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    metadata TEXT,
+    -- Stored bytes for either type: a text value is measured as its UTF-8
+    CONSTRAINT check_content_bytes CHECK(length(CAST(content AS BLOB)) <= {MAX_CONTENT_BYTES})
+)'''
+_CHANGES_COLUMNS = f'''(
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    competitor_name TEXT NOT NULL,
+    page_url TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    change_description TEXT,
+    old_content TEXT,
+    new_content TEXT,
+    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    notified BOOLEAN DEFAULT 0,
+    CONSTRAINT check_old_size CHECK(length(old_content) <= {CHANGE_CONTENT_CHARS}),
+    CONSTRAINT check_new_size CHECK(length(new_content) <= {CHANGE_CONTENT_CHARS})
+)'''
+SCHEMA_SQL = f'''
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS competitors (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    website TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    competitor_id INTEGER NOT NULL,
+    url TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    selector TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (competitor_id) REFERENCES competitors(id) ON DELETE CASCADE,
+    UNIQUE(competitor_id, url)
+);
+
+CREATE TABLE IF NOT EXISTS snapshots {_SNAPSHOTS_COLUMNS};
+
+CREATE TABLE IF NOT EXISTS changes {_CHANGES_COLUMNS};
+
+CREATE INDEX IF NOT EXISTS idx_competitor_url ON snapshots(competitor_name, page_url);
+-- Covers the date-window aggregates (report totals) without touching the
+-- table; supersedes the old detected_at-only index
+DROP INDEX IF EXISTS idx_changes_date;
+CREATE INDEX IF NOT EXISTS idx_changes_date_cover ON changes(detected_at DESC, competitor_name, page_type);
+CREATE INDEX IF NOT EXISTS idx_changes_competitor ON changes(competitor_name);
+CREATE INDEX IF NOT EXISTS idx_competitor_name ON competitors(name);
+
+-- Planner statistics so the indexes above get picked
+ANALYZE;
+
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+'''
+
+# Adding the CHECKs to a changes table created before them means rebuilding
+# it (SQLite can't ALTER constraints); run before SCHEMA_SQL, which then
+# recreates the indexes the DROP took with it.
+_REBUILD_CHANGES_SQL = f'''
+BEGIN;
+CREATE TABLE changes_rebuild {_CHANGES_COLUMNS};
+INSERT INTO changes_rebuild (id, competitor_name, page_url, page_type, change_description,
+                             old_content, new_content, detected_at, notified)
+SELECT id, competitor_name, page_url, page_type, change_description,
+       SUBSTR(old_content, 1, {CHANGE_CONTENT_CHARS}), SUBSTR(new_content, 1, {CHANGE_CONTENT_CHARS}),
+       detected_at, notified
+FROM changes;
+DROP TABLE changes;
+ALTER TABLE changes_rebuild RENAME TO changes;
+COMMIT;
+'''
+
+# Likewise for snapshots whose content column predates BLOB storage and the
+# byte-count CHECK; rows are copied as stored.
+_REBUILD_SNAPSHOTS_SQL = f'''
+BEGIN;
+CREATE TABLE snapshots_rebuild {_SNAPSHOTS_COLUMNS};
+INSERT INTO snapshots_rebuild (id, competitor_name, page_url, page_type, content_hash,
+                               content, scraped_at, metadata)
+SELECT id, competitor_name, page_url, page_type, content_hash, content, scraped_at, metadata
+FROM snapshots;
+DROP TABLE snapshots;
+ALTER TABLE snapshots_rebuild RENAME TO snapshots;
+COMMIT;
+'''
+
+
+# Statements run for every scraped page. sqlite3 keeps prepared statements
+# per connection keyed by SQL text, so these are parsed once per thread.
+STATEMENT_CACHE_SIZE = 256
+_SQL_INSERT_SNAPSHOT = '''
+    INSERT INTO snapshots (competitor_name, page_url, page_type, content_hash, content, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_SQL_LATEST_SNAPSHOT = '''
+    SELECT id, content_hash, content, scraped_at, metadata
+    FROM snapshots
+    WHERE competitor_name = ? AND page_url = ?
+    ORDER BY id DESC
+    LIMIT 1
+'''
+_SQL_INSERT_CHANGE = '''
+    INSERT INTO changes (competitor_name, page_url, page_type,
+                         change_description, old_content, new_content)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+
+def _pack_content(content: str):
+    """Compress snapshot content to a BLOB, or keep the text when that isn't smaller.
+    
+    The BLOB column stores either value as given, so rows written before
+    compression still read back as plain strings.
+    """
+    raw = content.encode('utf-8')
+    if zstandard is not None:
+        blob = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    else:
+        blob = zlib.compress(raw, ZLIB_LEVEL)
+    return blob if len(blob) < len(raw) else content
+
+
+def _unpack_content(value) -> str:
+    """Inverse of _pack_content"""
+    if not isinstance(value, bytes):
+        return value
+    if value[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("Snapshot is zstd-compressed; install the 'zstandard' package to read it")
+        return zstandard.ZstdDecompressor().decompress(value).decode('utf-8')
+    return zlib.decompress(value).decode('utf-8')
+
+
+def _change_snippet(value) -> Optional[str]:
+    """Old/new content as stored on a change: at most CHANGE_CONTENT_CHARS characters.
+    
+    Also takes bytes or a memoryview, sliced before decoding so a large
+    page body is never decoded in full.
+    """
+    if value is None or isinstance(value, str):
+        return value if value is None or len(value) <= CHANGE_CONTENT_CHARS else value[:CHANGE_CONTENT_CHARS]
+    head = bytes(memoryview(value)[:CHANGE_CONTENT_CHARS * 4])  # UTF-8 is at most 4 bytes/char
+    return head.decode('utf-8', 'ignore')[:CHANGE_CONTENT_CHARS]
+
+
+def _hash_bytes(content_hash) -> bytes:
+    """Raw digest for a content hash given as bytes or as a hex string (older rows)"""
+    if isinstance(content_hash, str):
+        return bytes.fromhex(content_hash)
+    return content_hash
+
+
+def _dump_metadata(metadata: Optional[Dict[str, Any]]):
+    """Serialize snapshot metadata (orjson bytes when available); None when empty"""
+    if not metadata:
+        return None
+    return orjson.dumps(metadata) if orjson is not None else json.dumps(metadata)
+
+
+def _load_metadata(value) -> Optional[Dict[str, Any]]:
+    """Inverse of _dump_metadata; both parsers accept str and bytes"""
+    if not value:
+        return None
+    return orjson.loads(value) if orjson is not None else json.loads(value)
+
+
+def _like_pattern(q: Optional[str]) -> Optional[str]:
+    """Turn a search string into a LIKE substring pattern (None = no filter)"""
+    if not q:
+        return None
+    escaped = q.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+
+class _ThreadConnection:
+    """Holds one thread's connection; dropped (and the connection with it) when the thread exits"""
+    __slots__ = ('conn', '__weakref__')
+    
+    def __init__(self, conn):
+        self.conn = conn
 
 
 class CompetitorDB:
     def __init__(self, db_path="competitor_data.db"):
         self.db_path = db_path
+        self._local = threading.local()
+        # Weak so finished worker threads don't keep their connections alive
+        self._open = weakref.WeakSet()
+        self._open_lock = threading.Lock()
+        atexit.register(self.close)
         self.init_database()
         logger.info(f"Database initialized: {db_path}")
     
+    def _connect(self):
+        """Open a connection for the calling thread and apply the pragmas once"""
+        # check_same_thread=False only so close() can run from the exit hook;
+        # each connection is still used by the one thread that opened it
+        conn = sqlite3.connect(self.db_path, timeout=10.0, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.execute('PRAGMA foreign_keys = ON')  # Enable foreign key constraints
+        conn.execute('PRAGMA journal_mode = WAL')  # Readers don't block the scraper's writes
+        conn.execute('PRAGMA synchronous = NORMAL')  # Safe with WAL, fewer fsyncs
+        conn.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+        conn.execute(f'PRAGMA cache_size = -{CACHE_SIZE_KIB}')
+        conn.execute('PRAGMA temp_store = MEMORY')  # Sorts and temp indexes stay off disk
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Context manager for database connections"""
-        conn = None
+        """Context manager yielding this thread's pooled database connection"""
+        holder = getattr(self._local, 'holder', None)
+        if holder is None:
+            holder = self._local.holder = _ThreadConnection(self._connect())
+            with self._open_lock:
+                self._open.add(holder)
+        conn = holder.conn
         try:
-            conn = sqlite3.connect(self.db_path, timeout=10.0)
-            conn.execute('PRAGMA foreign_keys = ON')  # Enable foreign key constraints
             yield conn
-        except sqlite3.Error as e:
-            logger.error(f"Database error: {e}")
-            if conn:
-                conn.rollback()
+        except Exception as e:
+            if isinstance(e, sqlite3.Error):
+                logger.error(f"Database error: {e}")
+            conn.rollback()
             raise
         finally:
-            if conn:
-                conn.close()
+            # The connection outlives the block, so never leave a transaction open
+            if conn.in_transaction:
+                conn.rollback()
+    
+    def close(self):
+        """Close every pooled connection (runs at interpreter exit).
+        
+        Closing the last connection checkpoints the WAL back into the main
+        database file. Threads reconnect on their next call.
+        """
+        with self._open_lock:
+            holders = list(self._open)
+            self._open.clear()
+        for holder in holders:
+            try:
+                holder.conn.close()
+            except sqlite3.Error as e:
+                logger.warning(f"Error closing database connection: {e}")
+        self._local = threading.local()
     
     def init_database(self):
         """Initialize database tables with proper schema"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Competitors table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS competitors (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT UNIQUE NOT NULL,
-                    website TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Pages table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS pages (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    competitor_id INTEGER NOT NULL,
-                    url TEXT NOT NULL,
-                    page_type TEXT NOT NULL,
-                    selector TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (competitor_id) REFERENCES competitors(id) ON DELETE CASCADE,
-                    UNIQUE(competitor_id, url)
-                )
-            ''')
-            
-            # Snapshots table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS snapshots (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    competitor_name TEXT NOT NULL,
-                    page_url TEXT NOT NULL,
-                    page_type TEXT NOT NULL,
-                    content_hash TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    metadata TEXT,
-                    CONSTRAINT check_content_size CHECK(length(content) <= ?)
-                )
-            ''', (MAX_CONTENT_SIZE,))
-            
-            # Changes table
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS changes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    competitor_name TEXT NOT NULL,
-                    page_url TEXT NOT NULL,
-                    page_type TEXT NOT NULL,
-                    change_description TEXT,
-                    old_content TEXT,
-                    new_content TEXT,
-                    detected_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    notified BOOLEAN DEFAULT 0
-                )
-            ''')
-            
-            # Indexes
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_competitor_url 
-                ON snapshots(competitor_name, page_url)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_changes_date 
-                ON changes(detected_at DESC)
-            ''')
-            
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_competitor_name
-                ON competitors(name)
-            ''')
-            
-            conn.commit()
+            cursor.execute('PRAGMA user_version')
+            if cursor.fetchone()[0] >= SCHEMA_VERSION:
+                return  # Schema already current: skip the DDL entirely
+            cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'changes'")
+            existing = cursor.fetchone()
+            if existing and 'check_old_size' not in existing[0]:
+                cursor.executescript(_REBUILD_CHANGES_SQL)
+                logger.info("Rebuilt changes table with content size constraints")
+            cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'snapshots'")
+            existing = cursor.fetchone()
+            if existing and 'check_content_bytes' not in existing[0]:
+                cursor.executescript(_REBUILD_SNAPSHOTS_SQL)
+                logger.info("Rebuilt snapshots table with BLOB content storage")
+            # One script, parsed and run in one call, inside one transaction
+            cursor.executescript(SCHEMA_SQL)
             logger.info("Database schema initialized successfully")
     
+    @contextmanager
+    def batch(self):
+        """Run several writes in one transaction (one commit, one fsync).
+        
+        Yields a cursor to pass as `cursor=` to save_snapshot/record_change;
+        commits on exit and rolls everything back on error.
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            yield cursor
+            conn.commit()
+    
     def save_snapshot(self, competitor_name: str, page_url: str, page_type: str, 
-                     content_hash: str, content: str, metadata: Optional[Dict[str, Any]] = None) -> int:
-        """Save a snapshot of scraped content"""
+                     content_hash: bytes, content: str, metadata: Optional[Dict[str, Any]] = None,
+                     cursor=None) -> int:
+        """Save a snapshot of scraped content (inside a batch() when `cursor` is given)"""
         # Truncate content if too large
         if len(content) > MAX_CONTENT_SIZE:
             logger.warning(f"Content truncated for {page_url}: {len(content)} bytes")
             content = content[:MAX_CONTENT_SIZE]
         
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO snapshots (competitor_name, page_url, page_type, content_hash, content, metadata)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (competitor_name, page_url, page_type, content_hash, content, 
-                 json.dumps(metadata) if metadata else None))
-            
-            conn.commit()
-            snapshot_id = cursor.lastrowid
-            logger.debug(f"Snapshot saved: {competitor_name} - {page_url}")
-            return snapshot_id
-    
+        if cursor is None:
+            with self.batch() as cursor:
+                return self.save_snapshot(competitor_name, page_url, page_type,
+                                          content_hash, content, metadata, cursor=cursor)
+        
+        cursor.execute(_SQL_INSERT_SNAPSHOT, (competitor_name, page_url, page_type,
+             _hash_bytes(content_hash), _pack_content(content), _dump_metadata(metadata)))
+        logger.debug(f"Snapshot saved: {competitor_name} - {page_url}")
+        return cursor.lastrowid
+
+    def save_snapshots_bulk(self, rows, cursor=None) -> int:
+        """Save many snapshots in one executemany call (inside a batch() when `cursor` is given).
+
+        `rows` yields (competitor_name, page_url, page_type, content_hash,
+        content, metadata) tuples; returns the number of rows inserted.
+        """
+        params = [
+            (competitor_name, page_url, page_type, _hash_bytes(content_hash),
+             _pack_content(content[:MAX_CONTENT_SIZE]), _dump_metadata(metadata))
+            for competitor_name, page_url, page_type, content_hash, content, metadata in rows
+        ]
+        if not params:
+            return 0
+
+        if cursor is None:
+            with self.batch() as cursor:
+                cursor.executemany(_SQL_INSERT_SNAPSHOT, params)
+        else:
+            cursor.executemany(_SQL_INSERT_SNAPSHOT, params)
+        logger.debug(f"Bulk saved {len(params)} snapshots")
+        return len(params)
+
     def get_latest_snapshot(self, competitor_name: str, page_url: str) -> Optional[Dict[str, Any]]:
         """Get the most recent snapshot for a specific page"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                SELECT id, content_hash, content, scraped_at, metadata
-                FROM snapshots
-                WHERE competitor_name = ? AND page_url = ?
-                ORDER BY scraped_at DESC
-                LIMIT 1
-            ''', (competitor_name, page_url))
+            cursor.execute(_SQL_LATEST_SNAPSHOT, (competitor_name, page_url))
             
             result = cursor.fetchone()
             
             if result:
                 return {
                     'id': result[0],
-                    'content_hash': result[1],
-                    'content': result[2],
+                    'content_hash': _hash_bytes(result[1]),
+                    'content': _unpack_content(result[2]),
                     'scraped_at': result[3],
-                    'metadata': json.loads(result[4]) if result[4] else None
+                    'metadata': _load_metadata(result[4])
                 }
             return None
     
     def record_change(self, competitor_name: str, page_url: str, page_type: str, 
-                     change_description: str, old_content: str, new_content: str) -> int:
-        """Record a detected change"""
-        with self.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO changes (competitor_name, page_url, page_type, 
-                                   change_description, old_content, new_content)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (competitor_name, page_url, page_type, change_description, 
-                 old_content[:1000], new_content[:1000]))  # Limit stored content
-            
-            conn.commit()
-            change_id = cursor.lastrowid
-            logger.info(f"Change recorded: {competitor_name} - {change_description[:50]}")
-            return change_id
-    
-    def get_recent_changes(self, limit: int = 50, days: int = 30) -> List[Dict[str, Any]]:
-        """Get recent changes with input validation"""
-        # Validate inputs
+                     change_description: str, old_content, new_content,
+                     cursor=None) -> int:
+        """Record a detected change (inside a batch() when `cursor` is given).
+        
+        old_content/new_content may be str, bytes or memoryview; pass
+        already-trimmed snippets where possible, only the first
+        CHANGE_CONTENT_CHARS characters are kept.
+        """
+        if cursor is None:
+            with self.batch() as cursor:
+                return self.record_change(competitor_name, page_url, page_type,
+                                          change_description, old_content, new_content, cursor=cursor)
+        
+        cursor.execute(_SQL_INSERT_CHANGE, (competitor_name, page_url, page_type, change_description, 
+             _change_snippet(old_content), _change_snippet(new_content)))
+        logger.info(f"Change recorded: {competitor_name} - {change_description[:50]}")
+        return cursor.lastrowid
+
+    def record_changes_bulk(self, rows, cursor=None) -> int:
+        """Record many changes in one executemany call (inside a batch() when `cursor` is given).
+
+        `rows` yields (competitor_name, page_url, page_type, change_description,
+        old_content, new_content) tuples; returns the number of rows inserted.
+        """
+        params = [
+            (competitor_name, page_url, page_type, change_description,
+             _change_snippet(old_content), _change_snippet(new_content))
+            for competitor_name, page_url, page_type, change_description, old_content, new_content in rows
+        ]
+        if not params:
+            return 0
+
+        if cursor is None:
+            with self.batch() as cursor:
+                cursor.executemany(_SQL_INSERT_CHANGE, params)
+        else:
+            cursor.executemany(_SQL_INSERT_CHANGE, params)
+        logger.info(f"Bulk recorded {len(params)} changes")
+        return len(params)
+
+    def _clamp_recent_args(self, limit, days):
+        """Validate and cap limit/days for recent-change queries"""
         if not isinstance(limit, int) or limit < 1:
             limit = 50
         if not isinstance(days, int) or days < 1:
             days = 30
+        return min(limit, 1000), min(days, 365)
+    
+    def _query_recent_changes(self, cursor, limit: int, days: int, offset: int = 0,
+                              q: Optional[str] = None, before_id: Optional[int] = None,
+                              summary_only: bool = False) -> List[Dict[str, Any]]:
+        pattern = _like_pattern(q)
+        cursor.row_factory = sqlite3.Row
+        content = '' if summary_only else 'old_content, new_content, '
+        cursor.execute(f'''
+            SELECT id, competitor_name, page_url, page_type, change_description, 
+                   {content}detected_at, notified
+            FROM changes
+            WHERE detected_at >= datetime('now', '-' || ? || ' days')
+              AND (? IS NULL OR competitor_name LIKE ? ESCAPE '\\'
+                   OR change_description LIKE ? ESCAPE '\\')
+              AND (? IS NULL OR id < ?)
+            ORDER BY id DESC
+            LIMIT ? OFFSET ?
+        ''', (days, pattern, pattern, pattern, before_id, before_id, limit, offset))
         
-        # Cap maximum values
-        limit = min(limit, 1000)
+        changes = [dict(row) for row in cursor]
+        for change in changes:
+            change['notified'] = bool(change['notified'])
+        return changes
+    
+    def get_recent_changes(self, limit: int = 50, days: int = 30, offset: int = 0,
+                           q: Optional[str] = None, before_id: Optional[int] = None,
+                           summary_only: bool = False) -> List[Dict[str, Any]]:
+        """Get recent changes, newest first, with input validation, optionally filtered by `q`.
+        
+        Page with `before_id` (the last id of the previous page): unlike
+        `offset`, the cost doesn't grow with the page number.
+        `summary_only` leaves out old_content/new_content for callers that
+        only list changes; get_change() returns them for a single change.
+        """
+        limit, days = self._clamp_recent_args(limit, days)
+        offset = max(offset, 0) if isinstance(offset, int) else 0
+        if not isinstance(before_id, int):
+            before_id = None
+        with self.get_connection() as conn:
+            return self._query_recent_changes(conn.cursor(), limit, days, offset, q, before_id,
+                                              summary_only)
+    
+    def _query_change_window_signature(self, cursor, days: int) -> tuple:
+        # All three read only idx_changes_date_cover
+        cursor.execute('''
+            WITH w AS (
+                SELECT id, competitor_name FROM changes
+                WHERE detected_at >= datetime('now', '-' || ? || ' days')
+            )
+            SELECT (SELECT MAX(id) FROM w),
+                   (SELECT COUNT(*) FROM w),
+                   (SELECT group_concat(competitor_name, char(10))
+                    FROM (SELECT DISTINCT competitor_name FROM w ORDER BY competitor_name))
+        ''', (days,))
+        return tuple(cursor.fetchone())
+    
+    def get_change_window_signature(self, days: int = 30) -> tuple:
+        """Get (max id, count, competitor names) of changes in the last `days` days.
+        
+        Moves whenever changes are added, deleted or age out, and whenever a
+        competitor with changes in the window is renamed.
+        """
+        if not isinstance(days, int) or days < 1:
+            days = 30
         days = min(days, 365)
         
+        with self.get_connection() as conn:
+            return self._query_change_window_signature(conn.cursor(), days)
+    
+    def get_change(self, change_id: int) -> Optional[Dict[str, Any]]:
+        """Get one change including its full old/new content"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute('''
-                SELECT id, competitor_name, page_url, page_type, change_description, 
+                SELECT id, competitor_name, page_url, page_type, change_description,
                        old_content, new_content, detected_at, notified
                 FROM changes
+                WHERE id = ?
+            ''', (change_id,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            change = dict(row)
+            change['notified'] = bool(change['notified'])
+            return change
+    
+    def get_change_aggregates(self, days: int = 30) -> List[tuple]:
+        """Get (competitor_name, page_type, count) for changes in the last `days` days"""
+        if not isinstance(days, int) or days < 1:
+            days = 30
+        days = min(days, 365)
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT competitor_name, page_type, COUNT(*)
+                FROM changes
                 WHERE detected_at >= datetime('now', '-' || ? || ' days')
-                ORDER BY detected_at DESC
-                LIMIT ?
-            ''', (days, limit))
-            
-            results = cursor.fetchall()
-            
-            changes = []
-            for row in results:
-                changes.append({
-                    'id': row[0],
-                    'competitor_name': row[1],
-                    'page_url': row[2],
-                    'page_type': row[3],
-                    'change_description': row[4],
-                    'old_content': row[5],
-                    'new_content': row[6],
-                    'detected_at': row[7],
-                    'notified': bool(row[8])
-                })
-            
-            return changes
+                GROUP BY competitor_name, page_type
+            ''', (days,))
+            return cursor.fetchall()
     
-    def get_competitor_stats(self) -> Dict[str, Any]:
-        """Get statistics for dashboard"""
+    def get_unnotified_changes(self) -> List[Dict[str, Any]]:
+        """Get changes that have not been sent out by the notifier yet, oldest first"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
-            
-            # Use COALESCE for null safety
-            cursor.execute('SELECT COUNT(DISTINCT competitor_name) FROM snapshots')
-            total_competitors = cursor.fetchone()[0] or 0
-            
-            cursor.execute('SELECT COUNT(*) FROM changes')
-            total_changes = cursor.fetchone()[0] or 0
-            
-            cursor.execute("""
-                SELECT COUNT(*) FROM changes 
-                WHERE detected_at >= datetime('now', '-7 days')
-            """)
-            recent_changes = cursor.fetchone()[0] or 0
-            
+            cursor.row_factory = sqlite3.Row
             cursor.execute('''
-                SELECT competitor_name, COUNT(*) as change_count
+                SELECT id, competitor_name, page_url, page_type, change_description, detected_at
                 FROM changes
-                GROUP BY competitor_name
-                ORDER BY change_count DESC
-                LIMIT 1
+                WHERE notified = 0
+                ORDER BY detected_at
             ''')
-            most_active = cursor.fetchone()
-            
-            return {
-                'total_competitors': total_competitors,
-                'total_changes': total_changes,
-                'recent_changes': recent_changes,
-                'most_active_competitor': most_active[0] if most_active else None,
-                'most_active_change_count': most_active[1] if most_active else 0
-            }
+            return [dict(row) for row in cursor]
+    
+    def mark_changes_notified(self, change_ids) -> int:
+        """Flag the given change ids (any iterable) as notified in one transaction"""
+        ids = iter(change_ids)
+        updated = 0
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # One write transaction (one fsync) for every batch; executemany
+            # reuses the single prepared UPDATE instead of building IN (...) lists
+            cursor.execute('BEGIN IMMEDIATE')
+            while True:
+                batch = [(change_id,) for change_id in islice(ids, NOTIFY_BATCH_SIZE)]
+                if not batch:
+                    break
+                cursor.executemany('UPDATE changes SET notified = 1 WHERE id = ?', batch)
+                updated += cursor.rowcount
+            conn.commit()
+        return updated
+    
+    def _query_stats(self, cursor) -> Dict[str, Any]:
+        # One statement, one row: changes is scanned once for both counts
+        cursor.execute("""
+            WITH
+                c AS (SELECT COUNT(DISTINCT competitor_name) AS n FROM snapshots),
+                t AS (SELECT COUNT(*) AS n,
+                             COALESCE(SUM(detected_at >= datetime('now', '-7 days')), 0) AS recent
+                      FROM changes),
+                m AS (SELECT competitor_name, COUNT(*) AS change_count
+                      FROM changes
+                      GROUP BY competitor_name
+                      ORDER BY change_count DESC
+                      LIMIT 1)
+            SELECT c.n, t.n, t.recent, m.competitor_name, m.change_count
+            FROM c, t LEFT JOIN m ON 1 = 1
+        """)
+        (total_competitors, total_changes, recent_changes,
+         most_active_name, most_active_count) = cursor.fetchone()
+        
+        return {
+            'total_competitors': total_competitors,
+            'total_changes': total_changes,
+            'recent_changes': recent_changes,
+            'most_active_competitor': most_active_name,
+            'most_active_change_count': most_active_count or 0
+        }
+    
+    def get_competitor_stats(self) -> Dict[str, Any]:
+        """Get statistics for dashboard"""
+        with self.get_connection() as conn:
+            return self._query_stats(conn.cursor())
     
     def get_all_competitors(self) -> List[Dict[str, Any]]:
         """Get list of all competitors with details (legacy method)"""
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             cursor.execute('''
                 SELECT 
-                    s.competitor_name,
+                    s.competitor_name AS name,
                     COUNT(DISTINCT s.page_url) as page_count,
                     MAX(s.scraped_at) as last_scraped,
-                    COALESCE((
-                        SELECT COUNT(*) 
-                        FROM changes c 
-                        WHERE c.competitor_name = s.competitor_name
-                    ), 0) as change_count
+                    COALESCE(MAX(c.change_count), 0) as change_count
                 FROM snapshots s
+                LEFT JOIN (
+                    SELECT competitor_name, COUNT(*) AS change_count
+                    FROM changes
+                    GROUP BY competitor_name
+                ) c ON c.competitor_name = s.competitor_name
                 GROUP BY s.competitor_name
                 ORDER BY s.competitor_name
             ''')
             
-            results = cursor.fetchall()
-            
-            competitors = []
-            for row in results:
-                competitors.append({
-                    'name': row[0],
-                    'page_count': row[1],
-                    'last_scraped': row[2],
-                    'change_count': row[3]
-                })
-            
-            return competitors
+            return [dict(row) for row in cursor]
+    
+    def _query_competitor_summaries(self, cursor, offset: int = 0, limit: int = -1,
+                                    q: Optional[str] = None,
+                                    name: Optional[str] = None) -> List[Dict[str, Any]]:
+        pattern = _like_pattern(q)
+        cursor.row_factory = sqlite3.Row
+        # Correlated subqueries instead of JOINs so the counts are not
+        # multiplied by each other; each one is an index lookup
+        cursor.execute('''
+            SELECT
+                c.name,
+                (SELECT COUNT(*) FROM pages p WHERE p.competitor_id = c.id) AS page_count,
+                (SELECT MAX(s.scraped_at) FROM snapshots s
+                 WHERE s.competitor_name = c.name) AS last_scraped,
+                (SELECT COUNT(*) FROM changes ch
+                 WHERE ch.competitor_name = c.name) AS change_count
+            FROM competitors c
+            WHERE (? IS NULL OR c.name LIKE ? ESCAPE '\\')
+              AND (? IS NULL OR c.name = ?)
+            ORDER BY c.name
+            LIMIT ? OFFSET ?
+        ''', (pattern, pattern, name, name, limit, offset))
+        return [dict(row) for row in cursor]
+    
+    def get_competitor_summaries(self, offset: int = 0, limit: int = -1,
+                                 q: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get competitors with page/change counts and last scrape in one query (limit -1 = all)"""
+        with self.get_connection() as conn:
+            return self._query_competitor_summaries(conn.cursor(), offset, limit, q)
+    
+    def get_competitor_summary(self, name: str) -> Optional[Dict[str, Any]]:
+        """Get one competitor's summary row (same shape as get_competitor_summaries)"""
+        with self.get_connection() as conn:
+            rows = self._query_competitor_summaries(conn.cursor(), limit=1, name=name)
+            return rows[0] if rows else None
+    
+    def get_dashboard_bundle(self, days: int = 30, competitor_limit: int = -1) -> Dict[str, Any]:
+        """Get stats, competitor summaries and the change window signature
+        (see get_change_window_signature) from one read transaction"""
+        if not isinstance(days, int) or days < 1:
+            days = 30
+        days = min(days, 365)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # One transaction so all three parts see the same database state
+            cursor.execute('BEGIN')
+            try:
+                return {
+                    'stats': self._query_stats(cursor),
+                    'competitors': self._query_competitor_summaries(conn.cursor(), limit=competitor_limit),
+                    'change_window': self._query_change_window_signature(cursor, days),
+                }
+            finally:
+                conn.commit()
     
     def _ensure_competitor_tables(self, cursor):
         """Ensure competitors and pages tables exist"""
@@ -313,6 +710,14 @@ class CompetitorDB:
             )
         ''')
     
+    def _insert_pages(self, cursor, competitor_id: int, pages: List[Dict[str, str]]):
+        """Insert all pages for a competitor in one executemany call"""
+        cursor.executemany('''
+            INSERT INTO pages (competitor_id, url, page_type, selector)
+            VALUES (?, ?, ?, ?)
+        ''', [(competitor_id, page['url'], page['type'], page.get('selector', ''))
+              for page in pages])
+    
     def add_competitor(self, name: str, website: str, pages: List[Dict[str, str]]) -> bool:
         """Add a new competitor with pages to the database"""
         try:
@@ -331,11 +736,7 @@ class CompetitorDB:
                 competitor_id = cursor.lastrowid
                 
                 # Insert pages
-                for page in pages:
-                    cursor.execute('''
-                        INSERT INTO pages (competitor_id, url, page_type, selector)
-                        VALUES (?, ?, ?, ?)
-                    ''', (competitor_id, page['url'], page['type'], page.get('selector', '')))
+                self._insert_pages(cursor, competitor_id, pages)
                 
                 conn.commit()
                 logger.info(f"Competitor added: {name} with {len(pages)} pages")
@@ -373,11 +774,7 @@ class CompetitorDB:
                 cursor.execute('DELETE FROM pages WHERE competitor_id = ?', (competitor_id,))
                 
                 # Insert new pages
-                for page in pages:
-                    cursor.execute('''
-                        INSERT INTO pages (competitor_id, url, page_type, selector)
-                        VALUES (?, ?, ?, ?)
-                    ''', (competitor_id, page['url'], page['type'], page.get('selector', '')))
+                self._insert_pages(cursor, competitor_id, pages)
                 
                 # Update snapshots and changes if name changed
                 if old_name != new_name:
@@ -421,20 +818,15 @@ class CompetitorDB:
                 competitor_id, name, website = result
                 
                 # Get pages
+                cursor.row_factory = sqlite3.Row
                 cursor.execute('''
-                    SELECT url, page_type, selector
+                    SELECT url, page_type AS type, COALESCE(selector, '') AS selector
                     FROM pages
                     WHERE competitor_id = ?
                     ORDER BY created_at
                 ''', (competitor_id,))
                 
-                pages = []
-                for row in cursor.fetchall():
-                    pages.append({
-                        'url': row[0],
-                        'type': row[1],
-                        'selector': row[2] or ''
-                    })
+                pages = [dict(row) for row in cursor]
                 
                 return {
                     'name': name,
@@ -452,36 +844,25 @@ class CompetitorDB:
             with self.get_connection() as conn:
                 cursor = conn.cursor()
                 
+                # One pass over competitors LEFT JOIN pages instead of a pages
+                # query per competitor; rows arrive grouped by competitor
                 cursor.execute('''
-                    SELECT id, name, website
-                    FROM competitors
-                    ORDER BY name
+                    SELECT c.id, c.name, c.website,
+                           p.url, p.page_type, COALESCE(p.selector, '')
+                    FROM competitors c
+                    LEFT JOIN pages p ON p.competitor_id = c.id
+                    ORDER BY c.name, c.id, p.created_at, p.id
                 ''')
                 
                 competitors = []
-                for row in cursor.fetchall():
-                    competitor_id, name, website = row
-                    
-                    # Get pages for this competitor
-                    cursor.execute('''
-                        SELECT url, page_type, selector
-                        FROM pages
-                        WHERE competitor_id = ?
-                        ORDER BY created_at
-                    ''', (competitor_id,))
-                    
-                    pages = []
-                    for page_row in cursor.fetchall():
-                        pages.append({
-                            'url': page_row[0],
-                            'type': page_row[1],
-                            'selector': page_row[2] or ''
-                        })
-                    
+                for (_, name, website), rows in groupby(cursor, key=itemgetter(0, 1, 2)):
                     competitors.append({
                         'name': name,
                         'website': website or '',
-                        'pages': pages
+                        # A competitor without pages yields one row of NULLs
+                        'pages': [{'url': url, 'type': page_type, 'selector': selector}
+                                  for *_, url, page_type, selector in rows
+                                  if url is not None]
                     })
                 
                 return competitors
@@ -526,22 +907,14 @@ class CompetitorDB:
     def get_competitor_pages(self, competitor_name: str) -> List[Dict[str, str]]:
         """Get all pages tracked for a competitor (legacy method)"""
         with self.get_connection() as conn:
-            cursor = cursor.cursor()
+            cursor = conn.cursor()
+            cursor.row_factory = sqlite3.Row
             
             cursor.execute('''
-                SELECT DISTINCT page_url, page_type
+                SELECT DISTINCT page_url AS url, page_type AS type
                 FROM snapshots
                 WHERE competitor_name = ?
                 ORDER BY page_url
             ''', (competitor_name,))
             
-            results = cursor.fetchall()
-            
-            pages = []
-            for row in results:
-                pages.append({
-                    'url': row[0],
-                    'type': row[1]
-                })
-            
-            return pages
+            return [dict(row) for row in cursor]
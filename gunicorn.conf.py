@@ -0,0 +1,22 @@
+"""
+Gunicorn settings for the dashboard
+Run with: gunicorn -c gunicorn.conf.py dashboard:app
+"""
+from config_loader import load_config
+
+_dashboard = load_config().get('dashboard', {})
+
+bind = f"{_dashboard.get('host', '0.0.0.0')}:{_dashboard.get('port', 5000)}"
+
+# Real threads, not gevent: sqlite3, ReportLab and BeautifulSoup are C/CPU
+# work that would block a gevent hub, and monkey-patching would turn the
+# per-thread DB connections and the scrape/report pools into greenlets.
+# Threads release the GIL in sqlite and socket calls, so a slow scrape or
+# PDF build no longer holds up other requests.
+worker_class = 'gthread'
+threads = 8
+
+# Keep a single worker: report jobs, scrape coalescing and the dashboard
+# snapshot are held in process memory and must be shared by every request
+workers = 1
+timeout = 120
@@ -5,17 +5,16 @@ Sends email and Slack alerts when changes are detected
 
 import smtplib
 import requests
-import yaml
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from config_loader import load_config
 from database import CompetitorDB
 
 
 class Notifier:
     def __init__(self, config_path="config.yaml"):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
         
         self.db = CompetitorDB()
         self.email_config = self.config['notifications']['email']
@@ -0,0 +1,129 @@
+"""
+PDF report generation for competitor tracking
+Imported lazily by the dashboard the first time a report is built, since ReportLab is slow to import
+"""
+
+import io
+from collections import Counter, defaultdict
+from datetime import datetime
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+from reportlab.platypus import (SimpleDocTemplate, Paragraph, Spacer,
+                                 Table, TableStyle, HRFlowable)
+
+# Styles are immutable once built, so they are created once at import
+# instead of on every report.
+PURPLE = colors.HexColor('#667eea')
+LIGHT  = colors.HexColor('#f0f2ff')
+GREY   = colors.HexColor('#e0e0e0')
+LINE   = colors.HexColor('#f0f0f0')
+TYPE_COLORS = {
+    'pricing':  ('#e8f5e9', '#27ae60'),
+    'features': ('#e3f2fd', '#1565c0'),
+    'blog':     ('#fff3e0', '#e65100'),
+    'other':    ('#f3e5f5', '#6a1b9a'),
+}
+mk = lambda **kw: ParagraphStyle('_', **kw)
+title_st   = mk(fontSize=22, fontName='Helvetica-Bold', textColor=PURPLE, spaceAfter=4)
+sub_st     = mk(fontSize=10, fontName='Helvetica', textColor=colors.HexColor('#7f8c8d'), spaceAfter=16)
+section_st = mk(fontSize=13, fontName='Helvetica-Bold', textColor=colors.HexColor('#2c3e50'), spaceBefore=16, spaceAfter=8)
+desc_st    = mk(fontSize=10, fontName='Helvetica', textColor=colors.HexColor('#2c3e50'), leading=15)
+url_st     = mk(fontSize=8, fontName='Helvetica', textColor=PURPLE)
+footer_st  = mk(fontSize=8, textColor=colors.HexColor('#bbbbbb'), alignment=TA_CENTER)
+count_st   = mk(fontSize=10, fontName='Helvetica', textColor=colors.HexColor('#7f8c8d'), alignment=TA_RIGHT)
+comp_st    = mk(fontSize=12, fontName='Helvetica-Bold', textColor=colors.HexColor('#2c3e50'))
+time_st    = mk(fontSize=8, fontName='Helvetica', textColor=colors.HexColor('#95a5a6'), alignment=TA_RIGHT)
+empty_st   = mk(fontSize=11, fontName='Helvetica')
+more_st    = mk(fontSize=9, fontName='Helvetica-Oblique', textColor=colors.HexColor('#7f8c8d'), leftIndent=12, spaceBefore=6)
+SUMMARY_TABLE_STYLE = TableStyle([
+    ('BACKGROUND',(0,0),(-1,0),PURPLE),('TEXTCOLOR',(0,0),(-1,0),colors.white),
+    ('FONTNAME',(0,0),(-1,0),'Helvetica-Bold'),('FONTSIZE',(0,0),(-1,0),8),
+    ('ALIGN',(0,0),(-1,-1),'CENTER'),('VALIGN',(0,0),(-1,-1),'MIDDLE'),
+    ('FONTNAME',(0,1),(-1,-1),'Helvetica-Bold'),('FONTSIZE',(0,1),(-1,-1),17),
+    ('TEXTCOLOR',(0,1),(-1,-1),colors.HexColor('#2c3e50')),
+    ('BACKGROUND',(0,1),(-1,-1),colors.HexColor('#f8f9fa')),
+    ('GRID',(0,0),(-1,-1),0.5,GREY),('TOPPADDING',(0,0),(-1,-1),10),('BOTTOMPADDING',(0,0),(-1,-1),10),
+])
+COMP_HEADER_STYLE = TableStyle([('BACKGROUND',(0,0),(-1,-1),LIGHT),('TOPPADDING',(0,0),(-1,-1),8),('BOTTOMPADDING',(0,0),(-1,-1),8),('LEFTPADDING',(0,0),(-1,-1),12),('RIGHTPADDING',(0,0),(-1,-1),12),('LINEBELOW',(0,0),(-1,-1),2,PURPLE)])
+# Each competitor's changes form one table: a change row (badge, description,
+# time) followed by a URL row, kept together across page breaks.
+DETAIL_COL_WIDTHS = [0.8*inch, 5*inch, 1.2*inch]
+DETAIL_BASE_CMDS = [('VALIGN',(0,0),(-1,-1),'TOP'),('LEFTPADDING',(0,0),(-1,-1),12),('RIGHTPADDING',(0,0),(-1,-1),12)]
+
+
+def detail_row_cmds(r):
+    """Style commands for the change row at index r and its URL row below."""
+    u = r + 1
+    return [('TOPPADDING',(0,r),(-1,r),10),('BOTTOMPADDING',(0,r),(-1,r),4),
+            ('TOPPADDING',(0,u),(-1,u),0),('BOTTOMPADDING',(0,u),(-1,u),8),
+            ('LINEBELOW',(0,u),(-1,u),0.5,LINE),('NOSPLIT',(0,r),(-1,u))]
+BADGE_LABEL_STYLES = {t: mk(fontSize=7, fontName='Helvetica-Bold', textColor=colors.HexColor(fg))
+                      for t, (bg, fg) in TYPE_COLORS.items()}
+BADGE_TABLE_STYLES = {t: TableStyle([('BACKGROUND',(0,0),(-1,-1),colors.HexColor(bg)),('TOPPADDING',(0,0),(-1,-1),4),('BOTTOMPADDING',(0,0),(-1,-1),4),('LEFTPADDING',(0,0),(-1,-1),6),('RIGHTPADDING',(0,0),(-1,-1),6)])
+                      for t, (bg, fg) in TYPE_COLORS.items()}
+
+
+def generate_pdf_report(changes, days=30, out=None, max_per_competitor=None, aggregates=None):
+    """Write the report to `out` (path or binary file); returns bytes when omitted.
+    At most `max_per_competitor` changes are listed per competitor (None = all).
+    `aggregates` are (competitor, page_type, count) rows for the summary counts;
+    when omitted they are counted from `changes`."""
+    buffer = io.BytesIO() if out is None else out
+    doc = SimpleDocTemplate(buffer, pagesize=letter,
+        leftMargin=0.75*inch, rightMargin=0.75*inch,
+        topMargin=0.75*inch, bottomMargin=0.75*inch)
+    story = []
+    story.append(Paragraph("Competitor Intelligence Report", title_st))
+    story.append(Paragraph(f"Generated: {datetime.now().strftime('%B %d, %Y at %H:%M')}  |  Period: Last {days} days", sub_st))
+    story.append(HRFlowable(width="100%", thickness=2, color=PURPLE, spaceAfter=20))
+    if not changes:
+        story.append(Paragraph(f"No changes detected in the last {days} days.", empty_st))
+        doc.build(story); return buffer.getvalue() if out is None else None
+    if aggregates is None:
+        pairs = Counter((ch['competitor_name'], ch['page_type']) for ch in changes)
+        aggregates = [(comp, ptype, n) for (comp, ptype), n in pairs.items()]
+    comp_totals = Counter()
+    by_type = Counter()
+    for comp, ptype, n in aggregates:
+        comp_totals[comp] += n
+        by_type[ptype] += n
+    by_competitor = defaultdict(list)
+    for ch in changes:
+        by_competitor[ch['competitor_name']].append(ch)
+    story.append(Paragraph("Summary", section_st))
+    sum_data = [
+        ['Total Changes', 'Competitors', 'Pricing', 'Features', 'Blog'],
+        [str(sum(comp_totals.values())), str(len(comp_totals)), str(by_type['pricing']), str(by_type['features']), str(by_type['blog'])]
+    ]
+    sum_tbl = Table(sum_data, colWidths=[1.34*inch]*5)
+    sum_tbl.setStyle(SUMMARY_TABLE_STYLE)
+    story.append(sum_tbl); story.append(Spacer(1,20))
+    story.append(Paragraph("Detailed Changes", section_st))
+    story.append(HRFlowable(width="100%", thickness=0.5, color=GREY, spaceAfter=12))
+    for comp_name, comp_changes in by_competitor.items():
+        total = max(comp_totals[comp_name], len(comp_changes))
+        hdr = Table([[Paragraph(comp_name, comp_st), Paragraph(f"{total} change{'s' if total>1 else ''}", count_st)]], colWidths=[5*inch, 2*inch])
+        hdr.setStyle(COMP_HEADER_STYLE)
+        story.append(hdr)
+        visible = comp_changes[:max_per_competitor]
+        rows, cmds = [], list(DETAIL_BASE_CMDS)
+        for ch in visible:
+            ptype = ch.get('page_type','other')
+            style_key = ptype if ptype in TYPE_COLORS else 'other'
+            badge = Table([[Paragraph(ptype.upper(), BADGE_LABEL_STYLES[style_key])]],
+                colWidths=[0.7*inch], style=BADGE_TABLE_STYLES[style_key])
+            cmds.extend(detail_row_cmds(len(rows)))
+            rows.append([badge, Paragraph(ch.get('change_description',''), desc_st), Paragraph(str(ch.get('detected_at',''))[:16], time_st)])
+            rows.append(['', Paragraph(ch.get('page_url',''), url_st), ''])
+        story.append(Table(rows, colWidths=DETAIL_COL_WIDTHS, style=TableStyle(cmds)))
+        hidden = total - len(visible)
+        if hidden:
+            story.append(Paragraph(f"\u2026 and {hidden} more change{'s' if hidden > 1 else ''}", more_st))
+        story.append(Spacer(1,14))
+    story.append(HRFlowable(width="100%", thickness=0.5, color=GREY, spaceBefore=10))
+    story.append(Paragraph("Generated by Competitor Intelligence Dashboard", footer_st))
+    doc.build(story)
+    return buffer.getvalue() if out is None else None
@@ -1,7 +1,7 @@
 import sqlite3
 import json
-import yaml
 import os
+from config_loader import load_config_copy, save_config
 
 def restore_config():
     print("Restoring config from database...")
@@ -68,8 +68,7 @@ def restore_config():
     
     # Read existing config
     if os.path.exists('config.yaml'):
-        with open('config.yaml', 'r') as f:
-            config = yaml.safe_load(f)
+        config = load_config_copy('config.yaml')
     else:
         config = {'dashboard': {'host': '0.0.0.0', 'port': 5000, 'debug': True}, 'scraping': {}}
     
@@ -77,10 +76,10 @@ def restore_config():
     config['competitors'] = config_competitors
     
     # Write back
-    with open('config.yaml', 'w') as f:
-        yaml.dump(config, f, default_flow_style=False, allow_unicode=True)
-    
-    print(f"Restored {len(config_competitors)} competitors to config.yaml")
+    if save_config(config, 'config.yaml'):
+        print(f"Restored {len(config_competitors)} competitors to config.yaml")
+    else:
+        print(f"config.yaml already lists these {len(config_competitors)} competitors, nothing to write")
 
 if __name__ == "__main__":
     restore_config()
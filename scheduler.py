@@ -5,18 +5,12 @@ Runs scraper and notifications at regular intervals
 
 import schedule
 import time
-import yaml
+from config_loader import load_config
 from scraper import CompetitorScraper
 from notifier import Notifier
 from datetime import datetime
 
 
-def load_config():
-    """Load configuration"""
-    with open('config.yaml', 'r') as f:
-        return yaml.safe_load(f)
-
-
 def run_scraping_job():
     """Job to run scraper and send notifications"""
     print(f"\n{'='*60}")
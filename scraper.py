@@ -6,30 +6,45 @@ Output: Plain English change descriptions
 
 import re
 import json
+import time
 import hashlib
-import yaml
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from datetime import datetime
+from collections import Counter, defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from config_loader import load_config
 from database import CompetitorDB
 
+# A competitor's scraped pages are written once all of them are in, or sooner
+# when this many rows or this many seconds' worth are waiting
+SAVE_BATCH_ROWS = 20
+SAVE_BATCH_SECONDS = 30
+
 
 class CompetitorScraper:
     def __init__(self, config_path="config.yaml"):
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        self.config = load_config(config_path)
 
         self.db = CompetitorDB()
         self.timeout = self.config['scraping'].get('timeout', 30)
+        # Fetches are network-bound, so this many pages are scraped at once
+        try:
+            max_workers = int(self.config['scraping'].get('max_workers', 5))
+        except (TypeError, ValueError):
+            max_workers = 5
+        self.max_workers = max(max_workers, 1)
 
         self.session = requests.Session()
         retry = Retry(total=3, backoff_factor=1,
                       status_forcelist=[429, 500, 502, 503, 504],
                       allowed_methods=["GET"])
-        adapter = HTTPAdapter(max_retries=retry)
+        # Keep connections to many competitor hosts alive between runs, with
+        # enough per host for every worker thread to hold one
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=50,
+                              pool_maxsize=max(self.max_workers, 10))
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         self.session.headers.update({
@@ -332,6 +347,18 @@ class CompetitorScraper:
     # SCRAPE ONE PAGE
     # ─────────────────────────────────────────
     def scrape_page(self, competitor_name, page_config):
+        rows = self.collect_page(competitor_name, page_config)
+        if rows is None:
+            return False
+        return self.save_page_rows([rows]) > 0
+
+    def collect_page(self, competitor_name, page_config):
+        """Scrape one page without writing it.
+
+        Returns (snapshot_row, change_row) for save_page_rows, change_row
+        being None when nothing changed or this is the first snapshot;
+        None when the page couldn't be fetched.
+        """
         url = page_config['url']
         page_type = page_config.get('type', 'other')
         selector = page_config.get('selector', '')
@@ -341,7 +368,7 @@ class CompetitorScraper:
 
         response = self.fetch_page(url)
         if not response:
-            return False
+            return None
 
         soup = BeautifulSoup(response.text, 'html.parser')
         soup = self.clean_soup(soup)
@@ -366,7 +393,7 @@ class CompetitorScraper:
             structured = {'text': soup.get_text(separator='\n', strip=True)[:5000]}
 
         structured_json = json.dumps(structured, sort_keys=True, ensure_ascii=False)
-        content_hash = hashlib.sha256(structured_json.encode()).hexdigest()
+        content_hash = hashlib.sha256(structured_json.encode()).digest()
 
         # ── Compare with previous snapshot ──
         previous = self.db.get_latest_snapshot(competitor_name, url)
@@ -377,18 +404,12 @@ class CompetitorScraper:
             'scraped_at': datetime.now().isoformat(),
         }
 
+        # FIXED: a snapshot is saved even when nothing changed, to update the timestamp
+        snapshot_row = (competitor_name, url, page_type, content_hash, structured_json, metadata)
+
         if previous and previous['content_hash'] == content_hash:
             print(f"  → No changes")
-            # FIXED: Still save a snapshot to update the timestamp
-            self.db.save_snapshot(
-                competitor_name=competitor_name,
-                page_url=url,
-                page_type=page_type,
-                content_hash=content_hash,
-                content=structured_json,
-                metadata=metadata
-            )
-            return False
+            return snapshot_row, None
 
         # ── Generate plain English change descriptions ──
         change_messages = []
@@ -423,29 +444,26 @@ class CompetitorScraper:
                 description = description[:497] + '...'
 
             print(f"  ✓ CHANGE: {description}")
-
-            self.db.record_change(
-                competitor_name=competitor_name,
-                page_url=url,
-                page_type=page_type,
-                change_description=description,
-                old_content=previous['content'][:1000],
-                new_content=structured_json[:1000],
-            )
         else:
             print(f"  → First snapshot saved")
 
-        # Save new snapshot
-        self.db.save_snapshot(
-            competitor_name=competitor_name,
-            page_url=url,
-            page_type=page_type,
-            content_hash=content_hash,
-            content=structured_json,
-            metadata=metadata
-        )
+        change_row = None
+        if previous:  # Only count as "change" if not first scrape
+            change_row = (competitor_name, url, page_type, description,
+                          previous['content'][:1000], structured_json[:1000])
+        return snapshot_row, change_row
 
-        return bool(previous)  # Only count as "change" if not first scrape
+    def save_page_rows(self, rows):
+        """Write (snapshot_row, change_row) pairs from collect_page.
+
+        Changes and snapshots go in together: one executemany each, one
+        transaction, one commit. Returns the number of changes recorded.
+        """
+        with self.db.batch() as cursor:
+            changes = self.db.record_changes_bulk(
+                [change for _, change in rows if change is not None], cursor=cursor)
+            self.db.save_snapshots_bulk([snapshot for snapshot, _ in rows], cursor=cursor)
+        return changes
 
     # ─────────────────────────────────────────
     # SCRAPE ALL
@@ -472,19 +490,42 @@ class CompetitorScraper:
             print("No pages configured for tracking.")
             return 0
 
+        remaining = Counter(name for name, _ in tasks)
+        pending = defaultdict(list)
+        oldest = {}  # competitor -> monotonic time its first unsaved rows arrived
         total_changes = 0
-        with ThreadPoolExecutor(max_workers=5) as executor:
+
+        def flush(name):
+            rows = pending.pop(name, [])
+            oldest.pop(name, None)
+            if not rows:
+                return 0
+            try:
+                return self.save_page_rows(rows)
+            except Exception as e:
+                print(f"  ✗ Error saving {len(rows)} pages for {name}: {e}")
+                return 0
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
             futures = {
-                executor.submit(self.scrape_page, name, page): (name, page)
+                executor.submit(self.collect_page, name, page): (name, page)
                 for name, page in tasks
             }
             for future in as_completed(futures):
                 name, page = futures[future]
                 try:
-                    if future.result():
-                        total_changes += 1
+                    rows = future.result()
+                    if rows is not None:
+                        pending[name].append(rows)
+                        oldest.setdefault(name, time.monotonic())
                 except Exception as e:
                     print(f"  ✗ Error scraping {name}: {e}")
+                remaining[name] -= 1
+                if remaining[name] == 0 or len(pending[name]) >= SAVE_BATCH_ROWS:
+                    total_changes += flush(name)
+                cutoff = time.monotonic() - SAVE_BATCH_SECONDS
+                for stale in [n for n, t in oldest.items() if t <= cutoff]:
+                    total_changes += flush(stale)
 
         print(f"\n{'='*60}")
         print(f"Done. {total_changes} changes detected.")
@@ -495,7 +536,7 @@ class CompetitorScraper:
     # REPORT
     # ─────────────────────────────────────────
     def generate_report(self, days=7):
-        changes = self.db.get_recent_changes(days=days)
+        changes = self.db.get_recent_changes(days=days, summary_only=True)
 
         if not changes:
             return f"No changes detected in the last {days} days."